@@ -0,0 +1,124 @@
+"""Per-stage timing of the PoseDetector preprocessing pipeline.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.preprocessing --input-size 1920x1080 --inference-size 640x360
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from pose_detector import PoseDetector
+
+
+def parse_size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def legacy_preprocess(frame, timings):
+    """The pre-buffer pipeline, kept here as the comparison baseline."""
+    start = time.perf_counter()
+    frame = cv2.resize(frame, (1280, 720))
+    timings["resize"].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+    l_channel, a_channel, b_channel = cv2.split(lab)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    l_channel = clahe.apply(l_channel)
+    enhanced = cv2.merge([l_channel, a_channel, b_channel])
+    timings["clahe"].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
+    rgb_frame = cv2.cvtColor(enhanced, cv2.COLOR_BGR2RGB)
+    timings["color"].append(time.perf_counter() - start)
+    return rgb_frame
+
+
+def buffered_preprocess(detector, frame, timings):
+    """detector.preprocess split into its timed stages.
+
+    analyze_frame hands preprocess the captured frame as is; the display
+    resize only happens afterwards, for the overlay, so it is not timed here.
+    """
+    start = time.perf_counter()
+    small = detector._resize_for_inference(frame)
+    timings["resize"].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    detector._equalize(small)
+    timings["clahe"].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    rgb_frame = detector._to_rgb()
+    timings["color"].append(time.perf_counter() - start)
+    return rgb_frame
+
+
+def report(name, timings):
+    total = np.sum([np.array(t) for t in timings.values()], axis=0)
+    print(f"{name}:")
+    for stage, values in timings.items():
+        values = np.array(values) * 1000
+        print(
+            f"  {stage:<10} mean {values.mean():7.3f} ms  p95 {np.percentile(values, 95):7.3f} ms"
+        )
+    print(f"  {'total':<10} mean {total.mean() * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input-size", type=parse_size, default=(1920, 1080))
+    parser.add_argument("--inference-size", type=parse_size, default=(1280, 720))
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument(
+        "--with-model", action="store_true", help="also time MediaPipe inference"
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    width, height = args.input_size
+    frames = [
+        rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(8)
+    ]
+    detector = PoseDetector(
+        inference_width=args.inference_size[0],
+        inference_height=args.inference_size[1],
+    )
+    # The split stages must produce exactly what preprocess does
+    expected = detector.preprocess(frames[0]).copy()
+    check = {"resize": [], "clahe": [], "color": []}
+    if not np.array_equal(buffered_preprocess(detector, frames[0], check), expected):
+        raise SystemExit("buffered_preprocess no longer matches preprocess")
+
+    legacy = {"resize": [], "clahe": [], "color": []}
+    buffered = {"resize": [], "clahe": [], "color": []}
+    if args.with_model:
+        legacy["inference"] = []
+        buffered["inference"] = []
+
+    for i in range(args.frames):
+        frame = frames[i % len(frames)]
+        for timings, rgb_frame in (
+            (legacy, legacy_preprocess(frame, legacy)),
+            (buffered, buffered_preprocess(detector, frame, buffered)),
+        ):
+            if args.with_model:
+                start = time.perf_counter()
+                detector.pose.process(rgb_frame)
+                timings["inference"].append(time.perf_counter() - start)
+
+    report("legacy (1280x720, per-frame CLAHE)", legacy)
+    report(
+        f"buffered ({args.inference_size[0]}x{args.inference_size[1]} inference)",
+        buffered,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Offline replay of recorded or synthetic frames through PoseDetector.process_frame.
+
+Frames come from a video file, a directory of images or a random generator,
+so no camera is needed. Each stage of the real process_frame path is timed
+by wrapping the detector's own methods. Run from the ``src`` directory:
+
+    python -m benchmarks.replay --video clip.mp4 --json report.json
+    python -m benchmarks.replay --images frames/ --frames 300
+    python -m benchmarks.replay --synthetic 1920x1080 --no-overlay
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+from collections import defaultdict
+
+import cv2
+import mediapipe
+import numpy as np
+
+import frame_sources
+from pose_detector import PoseDetector
+
+STAGES = ("resize", "clahe", "color", "inference", "scoring", "drawing")
+PERCENTILES = (50, 95, 99)
+
+
+def parse_size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def iter_frames(source):
+    if not source.open():
+        raise SystemExit(f"Could not open {source.__class__.__name__}")
+    try:
+        while True:
+            ok, frame = source.read()
+            if not ok:
+                break
+            yield frame
+    finally:
+        source.release()
+
+
+class StageTimer:
+    """Accumulates time spent in wrapped callables per stage and per frame."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._current = defaultdict(float)
+
+    def wrap(self, stage, func):
+        current = self._current
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current[stage] += time.perf_counter() - start
+
+        return timed
+
+    def start_frame(self):
+        self._current.clear()
+
+    def end_frame(self, total):
+        for stage in STAGES:
+            self.samples[stage].append(self._current.get(stage, 0.0))
+        self.samples["total"].append(total)
+
+
+class _TimedPose:
+    """Times pose.process; the MediaPipe object does not take new attributes."""
+
+    def __init__(self, pose, timer):
+        self._pose = pose
+        self.process = timer.wrap("inference", pose.process)
+
+    def __getattr__(self, name):
+        return getattr(self._pose, name)
+
+
+def instrument(detector, timer):
+    """Wrap the detector's stage methods on the instance only"""
+    for stage, name in (
+        ("resize", "_resize_for_inference"),
+        ("resize", "resize_for_display"),
+        ("clahe", "_equalize"),
+        ("color", "_to_rgb"),
+        ("scoring", "_calculate_posture_score"),
+        ("drawing", "draw_overlay"),
+    ):
+        setattr(detector, name, timer.wrap(stage, getattr(detector, name)))
+    detector.pose = _TimedPose(detector.pose, timer)
+
+
+def summarize(samples, wall_time):
+    frames = len(samples["total"])
+    stages = {}
+    for stage, values in samples.items():
+        values = np.array(values) * 1000
+        stats = {"mean_ms": float(values.mean())}
+        for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            stats[f"p{p}_ms"] = float(value)
+        stages[stage] = stats
+    return {
+        "frames": frames,
+        "wall_time_s": wall_time,
+        "fps": frames / wall_time if wall_time else 0.0,
+        "stages": stages,
+    }
+
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "mediapipe": mediapipe.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def print_report(report):
+    print(
+        f"{report['frames']} frames in {report['wall_time_s']:.2f} s "
+        f"({report['fps']:.1f} fps)"
+    )
+    for stage in (*STAGES, "total"):
+        stats = report["stages"][stage]
+        print(
+            f"  {stage:<10} mean {stats['mean_ms']:7.3f} ms"
+            + "".join(f"  p{p} {stats[f'p{p}_ms']:7.3f} ms" for p in PERCENTILES)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    inputs = parser.add_mutually_exclusive_group()
+    inputs.add_argument("--video", help="video file to replay")
+    inputs.add_argument("--images", help="directory of images, replayed in name order")
+    inputs.add_argument(
+        "--synthetic",
+        type=parse_size,
+        metavar="WxH",
+        help="random frames of this size (default 1280x720)",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=300, help="max frames, 0 for all (default 300)"
+    )
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--inference-size", type=parse_size, default=(1280, 720))
+    parser.add_argument("--no-overlay", action="store_true", help="skip drawing")
+    parser.add_argument(
+        "--roi",
+        action="store_true",
+        help="enable ROI tracking, which the apps only use with --roi-tracking",
+    )
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    if args.video:
+        source, source_name = (
+            frame_sources.VideoFileSource(args.video),
+            f"video:{args.video}",
+        )
+    elif args.images:
+        source = frame_sources.ImageDirectorySource(args.images)
+        source_name = f"images:{args.images}"
+    else:
+        size = args.synthetic or (1280, 720)
+        source, source_name = (
+            frame_sources.SyntheticSource(*size),
+            f"synthetic:{size[0]}x{size[1]}",
+        )
+    frames = iter_frames(source)
+    if args.frames == 0 and not (args.video or args.images):
+        parser.error("--frames 0 needs a finite --video or --images source")
+
+    detector = PoseDetector(
+        inference_width=args.inference_size[0],
+        inference_height=args.inference_size[1],
+        roi_tracking=args.roi,
+    )
+    detector.render_overlay = not args.no_overlay
+
+    # Warm-up frames load the model graph and are not measured
+    for _ in range(args.warmup):
+        frame = next(frames, None)
+        if frame is None:
+            break
+        detector.process_frame(frame)
+
+    timer = StageTimer()
+    instrument(detector, timer)
+    wall_time = 0.0
+    for frame in frames:
+        timer.start_frame()
+        start = time.perf_counter()
+        detector.process_frame(frame)
+        elapsed = time.perf_counter() - start
+        timer.end_frame(elapsed)
+        wall_time += elapsed
+        if args.frames and len(timer.samples["total"]) >= args.frames:
+            break
+    detector.close()
+
+    if not timer.samples["total"]:
+        raise SystemExit("No frames were measured")
+
+    report = summarize(timer.samples, wall_time)
+    report["config"] = {
+        "source": source_name,
+        "inference_size": list(args.inference_size),
+        "overlay": detector.render_overlay,
+        "roi_tracking": args.roi,
+        "warmup": args.warmup,
+    }
+    report["machine"] = machine_info()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Batch posture scoring vs the original one-pose-at-a-time scorer.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.scoring --poses 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import posture_score
+from pose_detector import PoseDetector
+from posture_score import DEFAULT_THRESHOLDS as T
+from posture_score import DEFAULT_WEIGHTS, EARS, HIPS, NOSE, SHOULDERS
+
+angle_between = PoseDetector.angle_between
+IDEAL = np.array([0, -1, 0])
+
+
+def legacy_score(points):
+    """The scalar scorer as it was before score_poses, kept as the baseline."""
+    nose = points[NOSE]
+    ears = points[EARS]
+    shoulders = points[SHOULDERS]
+    hips = points[HIPS]
+    mid_ear = np.mean(ears, axis=0)
+    mid_shoulder = np.mean(shoulders, axis=0)
+    mid_hip = np.mean(hips, axis=0)
+
+    head_tilt = np.clip(1 - abs(nose[2] - mid_ear[2]) * T["head_tilt"], 0, 1)
+    neck_angle = angle_between(mid_ear - mid_shoulder, IDEAL)
+    neck = np.clip(1 - abs(neck_angle) / T["neck_angle"], 0, 1)
+    shoulder_diff = shoulders[0] - shoulders[1]
+    level = np.clip(1 - abs(shoulder_diff[1]) * T["shoulder_level"], 0, 1)
+    roll = np.clip(1 - abs(shoulder_diff[2]) * T["shoulder_roll"], 0, 1)
+    spine_angle = angle_between(mid_shoulder - mid_hip, IDEAL)
+    spine = np.clip(1 - abs(spine_angle) / T["spine_angle"], 0, 1)
+    ear_distance = np.linalg.norm(ears[1] - ears[0])
+    ideal_ear_distance = np.linalg.norm(shoulders[1] - shoulders[0]) * 0.7
+    rotation = np.clip(
+        1 - abs(ear_distance - ideal_ear_distance) / (ideal_ear_distance + 1e-6), 0, 1
+    )
+    side_tilt = np.clip(1 - abs(ears[0][1] - ears[1][1]) * 5, 0, 1)
+    scores = np.array([head_tilt, neck, level, roll, spine, rotation, side_tilt])
+    return np.clip(np.dot(scores, DEFAULT_WEIGHTS) * 100, 0, 100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--poses", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    landmarks = rng.uniform(0, 1, (args.poses, 33, 4)).astype(np.float32)
+
+    start = time.perf_counter()
+    legacy = np.array([legacy_score(pose[:, :3]) for pose in landmarks])
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch, _ = posture_score.score_poses(landmarks)
+    batch_time = time.perf_counter() - start
+
+    print(f"poses            {args.poses}")
+    print(f"legacy scalar    {legacy_time * 1e6 / args.poses:8.2f} us/pose")
+    print(f"score_poses      {batch_time * 1e6 / args.poses:8.2f} us/pose")
+    print(f"speedup          {legacy_time / batch_time:8.1f}x")
+    print(f"max score diff   {np.abs(legacy - batch).max():8.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Cold-start cost: module import times and time until the tray icon shows.
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+Run from the ``src`` directory:
+
+    python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+MODULES = (
+    "pose_landmarks",
+    "posture_score",
+    "pose_detector",
+    "db_manager",
+    "daemon",
+    "tray_application",
+    "mediapipe",
+)
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(int("mediapipe" in sys.modules))
+"""
+
+# Prints one JSON line per milestone, in seconds since the script started
+TRAY_SCRIPT = """
+import json, time
+start = time.perf_counter()
+
+def mark(name):
+    print(json.dumps({"event": name, "t": time.perf_counter() - start}), flush=True)
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+from tray_application import MODEL_WARMUP_DELAY_MS, PostureTrackerTray
+mark("imported")
+app = QApplication([])
+tray = PostureTrackerTray()
+mark("icon")
+
+def model_ready():
+    tray.detector.wait_for_model()
+    mark("model")
+    tray.detector.close()
+    app.quit()
+
+QTimer.singleShot(MODEL_WARMUP_DELAY_MS + 10, model_ready)
+app.exec()
+"""
+
+
+def run_python(script):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return result.stdout.splitlines(), time.perf_counter() - start
+
+
+def measure_imports(runs):
+    results = {}
+    for module in MODULES:
+        times = []
+        for _ in range(runs):
+            lines, _ = run_python(IMPORT_SCRIPT.format(module=module))
+            times.append(float(lines[0]))
+        results[module] = {
+            "median_ms": float(np.median(times) * 1000),
+            "loads_mediapipe": lines[1] == "1",
+        }
+    return results
+
+
+def measure_tray(runs):
+    samples = {"imported": [], "icon": [], "model": [], "process_wall": []}
+    for _ in range(runs):
+        lines, wall = run_python(TRAY_SCRIPT)
+        for line in lines:
+            if line.startswith("{"):
+                event = json.loads(line)
+                samples[event["event"]].append(event["t"])
+        samples["process_wall"].append(wall)
+    return {
+        name: float(np.median(values) * 1000) if values else None
+        for name, values in samples.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    imports = measure_imports(args.runs)
+    print("import time (median of fresh interpreters):")
+    for module, stats in imports.items():
+        note = "  loads mediapipe" if stats["loads_mediapipe"] else ""
+        print(f"  {module:<18} {stats['median_ms']:8.1f} ms{note}")
+
+    tray = measure_tray(args.runs)
+    print("tray startup (ms since the script started):")
+    print(f"  imports done       {tray['imported']:8.1f} ms")
+    print(f"  icon visible       {tray['icon']:8.1f} ms")
+    print(
+        f"  model ready        {tray['model']:8.1f} ms"
+        f"  (loads in the background after {tray['icon']:.0f} ms)"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"imports": imports, "tray": tray}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
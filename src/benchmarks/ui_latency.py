@@ -0,0 +1,87 @@
+"""Qt event-loop latency while pose detection runs in-process vs out-of-process.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.ui_latency --seconds 10
+"""
+
+import argparse
+import sys
+import time
+from threading import Event, Thread
+
+import numpy as np
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from pose_detector import PoseDetector
+from pose_worker import ProcessPoseDetector
+
+TICK_MS = 10
+
+
+def run_detection(detector, frames, stop, counter):
+    i = 0
+    while not stop.is_set():
+        detector.process_frame(frames[i % len(frames)])
+        counter[0] += 1
+        i += 1
+
+
+def measure(app, detector, frames, seconds):
+    # Warm up so model loading is not part of the measurement
+    detector.process_frame(frames[0])
+
+    stop = Event()
+    counter = [0]
+    worker = Thread(target=run_detection, args=(detector, frames, stop, counter))
+    worker.start()
+
+    lateness = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        lateness.append((now - last[0]) * 1000 - TICK_MS)
+        last[0] = now
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(TICK_MS)
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+    timer.stop()
+    stop.set()
+    worker.join()
+    detector.close()
+
+    lateness = np.maximum(np.array(lateness[1:]), 0)
+    return lateness, counter[0] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8) for _ in range(4)]
+
+    for name, detector in (
+        ("in-process", PoseDetector()),
+        ("out-of-process", ProcessPoseDetector()),
+    ):
+        lateness, fps = measure(app, detector, frames, args.seconds)
+        print(
+            f"{name:<15} tick lateness mean {lateness.mean():6.2f} ms  "
+            f"p95 {np.percentile(lateness, 95):6.2f} ms  "
+            f"max {lateness.max():6.2f} ms  ({fps:.1f} detections/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Command line options shared by main.py, daemon.py and pipeline_manager.py.
+
+Each function returns a parent parser to pass in ``parents=[...]``.
+"""
+
+import argparse
+
+SOURCE_HELP = "camera index, video file, image directory or synthetic[:WxH]"
+
+
+def source_options(multiple=False):
+    parser = argparse.ArgumentParser(add_help=False)
+    if multiple:
+        parser.add_argument(
+            "--source",
+            action="append",
+            required=True,
+            help=f"{SOURCE_HELP}; repeat for each pipeline",
+        )
+    else:
+        parser.add_argument("--source", default="0", help=f"{SOURCE_HELP} (default 0)")
+    return parser
+
+
+def detector_options(fixed_quality=True, roi_tracking=True):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--out-of-process",
+        action="store_true",
+        help="run pose detection in a separate worker process",
+    )
+    if roi_tracking:
+        parser.add_argument(
+            "--roi-tracking",
+            action="store_true",
+            help="run inference on the area around the last detected pose",
+        )
+    if fixed_quality:
+        parser.add_argument(
+            "--fixed-quality",
+            action="store_true",
+            help="keep model complexity 1 at 1280x720 instead of tuning to "
+            "the machine",
+        )
+    return parser
+
+
+def headless_options():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--log-format", choices=("text", "json"), default="text")
+    parser.add_argument(
+        "--log-interval",
+        type=float,
+        default=10.0,
+        help="seconds between score log lines (default 10)",
+    )
+    parser.add_argument(
+        "--db-save-interval",
+        type=float,
+        default=60.0,
+        help="seconds between database saves (default 60)",
+    )
+    return parser
+
+
+def stats_options():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--stats-file",
+        help="collect performance stats and write them to this file; "
+        "a .prom suffix selects Prometheus text format, otherwise JSON",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=10.0,
+        help="seconds between stats file writes (default 10)",
+    )
+    return parser
@@ -0,0 +1,249 @@
+"""Headless posture tracker: capture, detect, score, notify and log without Qt.
+
+Run from the ``src`` directory:
+
+    python daemon.py --source 0 --db posture_data.db --log-format json
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import time
+from threading import Event
+
+import cli_options
+from db_manager import DBManager
+from frame_sources import create_source
+from instrumentation import StatsExporter
+from motion_gate import MotionGate
+from notifications import NotificationManager
+from quality_tuner import QualityTuner
+from rate_scheduler import AdaptiveRateScheduler
+from score_history import ScoreHistory
+from webcam import Webcam
+
+logger = logging.getLogger("posture_tracker")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; fields passed as ``extra={"fields": {...}}``"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class TextFormatter(logging.Formatter):
+    """``time level event key=value ...`` for reading in a terminal"""
+
+    def format(self, record):
+        fields = getattr(record, "fields", {})
+        line = " ".join(
+            [
+                self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+                record.levelname.lower(),
+                record.getMessage(),
+                *(f"{key}={value}" for key, value in fields.items()),
+            ]
+        )
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging(log_format="text", level=logging.INFO):
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+class ResultRecorder:
+    """Per-camera handling of analysis results, without logging or a UI.
+
+    Adds each score to the history, feeds the score variance back to the
+    rate scheduler, saves landmarks to ``db`` at most every
+    ``db_save_interval`` seconds and passes the average to ``notifier``.
+    """
+
+    def __init__(self, rate_scheduler, db=None, notifier=None, db_save_interval=60):
+        self.scores = ScoreHistory()
+        self.rate_scheduler = rate_scheduler
+        self.db = db
+        self.notifier = notifier
+        self.db_save_interval = db_save_interval
+        self.last_db_save = 0
+
+    def record(self, score, results, timestamp):
+        """Handle one result; returns the updated average score"""
+        self.scores.add_score(score, timestamp)
+        average_score = self.scores.get_average_score()
+        self.rate_scheduler.observe_score_variance(self.scores.get_score_variance())
+
+        now = time.time()
+        if (
+            self.db
+            and results
+            and results.pose_landmarks
+            and now - self.last_db_save >= self.db_save_interval
+        ):
+            self.db.save_pose_data(results.pose_landmarks, average_score)
+            self.last_db_save = now
+
+        if self.notifier:
+            self.notifier.check_and_notify(average_score)
+        return average_score
+
+
+class PostureDaemon:
+    """The tray's capture → detect → history → notify/DB pipeline, minus Qt.
+
+    Results are handled directly on the Webcam inference thread; there is no
+    UI thread to hand them to.
+    """
+
+    def __init__(
+        self,
+        source,
+        detector=None,
+        db_path=None,
+        notify=True,
+        db_save_interval=60,
+        log_interval=10,
+        out_of_process=False,
+        auto_quality=True,
+        roi_tracking=False,
+    ):
+        if detector is None:
+            if out_of_process:
+                from pose_worker import ProcessPoseDetector
+
+                detector = ProcessPoseDetector(roi_tracking=roi_tracking)
+            else:
+                from pose_detector import PoseDetector
+
+                detector = PoseDetector(roi_tracking=roi_tracking)
+        self.detector = detector
+        self.detector.render_overlay = False
+
+        self.rate_scheduler = AdaptiveRateScheduler(min_fps=1, max_fps=30)
+        self.frame_reader = Webcam(
+            rate_scheduler=self.rate_scheduler,
+            motion_gate=MotionGate(),
+            result_callback=self.on_analysis_result,
+            source=source,
+        )
+        if auto_quality:
+            self.frame_reader.quality_tuner = QualityTuner(self.detector)
+        self.db = DBManager(db_path) if db_path else None
+        self.recorder = ResultRecorder(
+            self.rate_scheduler,
+            db=self.db,
+            notifier=NotificationManager() if notify else None,
+            db_save_interval=db_save_interval,
+        )
+        self.scores = self.recorder.scores
+        self.log_interval = log_interval
+        self.last_log = 0
+        self._stop_event = Event()
+        self._signum = None
+
+    def run(self):
+        """Track until stop() is called or the frame source runs out"""
+        if not self.frame_reader.start(callback=self.detector.process_frame):
+            logger.error("source_unavailable")
+            return False
+        logger.info("started", extra={"fields": {"pid": os.getpid()}})
+        while not self._stop_event.wait(0.5):
+            if not self.frame_reader.is_running.is_set():
+                logger.info("source_ended")
+                break
+        if self._signum is not None:
+            logger.info("signal", extra={"fields": {"signum": self._signum}})
+        self.shutdown()
+        return True
+
+    def stop(self, signum=None, frame=None):
+        """Safe to call from a signal handler; run() logs and cleans up"""
+        self._signum = signum
+        self._stop_event.set()
+
+    def shutdown(self):
+        self.frame_reader.stop()
+        if self.db:
+            self.db.close()
+        self.detector.close()
+        logger.info("stopped", extra={"fields": self.frame_reader.get_stats()})
+
+    def on_analysis_result(self, frame, score, results, timestamp):
+        average_score = self.recorder.record(score, results, timestamp)
+
+        now = time.time()
+        if now - self.last_log >= self.log_interval:
+            self.last_log = now
+            logger.info(
+                "score",
+                extra={
+                    "fields": {
+                        "score": round(float(score), 1),
+                        "average": round(average_score, 1),
+                        "pose": results is not None,
+                        "interval_s": round(self.rate_scheduler.interval, 3),
+                        **self.frame_reader.get_stats(),
+                    }
+                },
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        parents=[
+            cli_options.source_options(),
+            cli_options.detector_options(),
+            cli_options.headless_options(),
+            cli_options.stats_options(),
+        ],
+    )
+    parser.add_argument("--db", help="log scores and landmarks to this database")
+    parser.add_argument("--no-notify", action="store_true", help="log only")
+    args = parser.parse_args()
+
+    configure_logging(args.log_format)
+    daemon = PostureDaemon(
+        create_source(args.source),
+        db_path=args.db,
+        notify=not args.no_notify,
+        db_save_interval=args.db_save_interval,
+        log_interval=args.log_interval,
+        out_of_process=args.out_of_process,
+        auto_quality=not args.fixed_quality,
+        roi_tracking=args.roi_tracking,
+    )
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+
+    stats_exporter = None
+    if args.stats_file:
+        stats_exporter = StatsExporter(args.stats_file, args.stats_interval)
+        stats_exporter.start()
+    try:
+        ok = daemon.run()
+    finally:
+        if stats_exporter:
+            stats_exporter.stop()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
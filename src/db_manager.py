@@ -1,39 +1,297 @@
+import logging
 import sqlite3
+import time
 from datetime import datetime
+from itertools import groupby
+from queue import Empty, Full, Queue
+from threading import Event, Thread
 
+import numpy as np
+
+from instrumentation import metrics
 from pose_landmarks import POSTURE_LANDMARKS
 
+logger = logging.getLogger("posture_tracker")
+
+# Queue marker that stops the writer thread
+_STOP = object()
+
+# Stored in PRAGMA user_version. 0 is the original layout with ISO-8601 text
+# timestamps and one pose_landmarks row per landmark; 1 stores epoch-ms
+# integers and one row per snapshot with the landmarks packed in a blob;
+# 2 adds timestamp indexes and the score rollup tables.
+SCHEMA_VERSION = 2
+
+# Score rollups are kept per local minute, hour and day, in tables named
+# score_rollup_<resolution> keyed by the bucket's start in epoch ms
+ROLLUP_RESOLUTIONS = ("minute", "hour", "day")
+ROLLUP_DTYPE = np.dtype(
+    [
+        ("bucket", np.int64),
+        ("count", np.int64),
+        ("mean", np.float64),
+        ("min", np.float64),
+        ("max", np.float64),
+        ("below_ms", np.int64),
+    ]
+)
+
+# Each stored landmark is x, y, z, visibility as float32, in the order of
+# POSTURE_LANDMARKS
+LANDMARK_FIELDS = 4
+
 
 class DBManager:
-    def __init__(self, db_path: str):
-        self.conn = sqlite3.connect(db_path)
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 200,
+        flush_interval: float = 5.0,
+        max_queue: int = 10000,
+        poor_posture_threshold: float = 60,
+        max_sample_gap: float = 120.0,
+    ):
+        if db_path == ":memory:" or str(db_path).startswith("file::memory:"):
+            # The writer thread opens its own connection, which would be a
+            # separate, empty in-memory database
+            raise ValueError("DBManager needs a database file, not ':memory:'")
+        self.db_path = db_path
+        self.conn = self._connect()
         self.cursor = self.conn.cursor()
         self.posture_landmarks = POSTURE_LANDMARKS
-        self._create_tables()
+
+        # Rollups count each score as lasting until the next one, capped at
+        # max_sample_gap so gaps between sessions are not counted. Each
+        # connection tracks its own last committed score time.
+        self.poor_posture_threshold = poor_posture_threshold
+        self.max_sample_gap_ms = int(max_sample_gap * 1000)
+        try:
+            self._create_tables()
+        except BaseException:
+            self.conn.close()
+            raise
+        self._last_score_ms = self._committed_last_score_ms(self.conn)
+
+        # Background writer: rows queued by save_pose_data are committed in
+        # batches, one transaction per flush, so callers never wait on fsync
+        self.batch_size = batch_size  # rows pending before a flush
+        self.flush_interval = flush_interval  # seconds before a flush
+        self.dropped_rows = 0
+        self._queue = Queue(maxsize=max_queue)
+        self._writer = Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        # A DBManager may be built on one thread and handed to another, as
+        # the tray does; each connection is still used by one thread at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL lets readers run alongside the writer; NORMAL only fsyncs at
+        # checkpoints, which is safe in WAL mode
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
 
     def _create_tables(self):
-        # Create table for overall posture scores
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0 and self._table_exists("pose_landmarks"):
+            self._migrate_v0()
+
+        # Overall posture scores, timestamps in epoch milliseconds
         self.create_table(
             "posture_scores",
             [
-                ("timestamp", "DATETIME"),
+                ("timestamp", "INTEGER"),
                 ("score", "FLOAT"),
             ],
         )
 
-        # Create table for individual landmark positions
+        # One row per snapshot; landmarks is a packed float32 blob of shape
+        # (len(POSTURE_LANDMARKS), LANDMARK_FIELDS)
         self.create_table(
             "pose_landmarks",
             [
-                ("timestamp", "DATETIME"),
-                ("landmark_name", "TEXT"),
-                ("x", "FLOAT"),
-                ("y", "FLOAT"),
-                ("z", "FLOAT"),
-                ("visibility", "FLOAT"),
+                ("timestamp", "INTEGER"),
+                ("landmarks", "BLOB"),
             ],
         )
 
+        for table_name in ("posture_scores", "pose_landmarks"):
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table_name}_timestamp "
+                f"ON {table_name} (timestamp)"
+            )
+        for resolution in ROLLUP_RESOLUTIONS:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS score_rollup_{resolution} ("
+                "bucket INTEGER PRIMARY KEY, count INTEGER, total FLOAT, "
+                "min FLOAT, max FLOAT, below_ms INTEGER)"
+            )
+        if version < 2:
+            self._rebuild_rollups()
+
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+    @staticmethod
+    def _committed_last_score_ms(conn):
+        return conn.execute("SELECT MAX(timestamp) FROM posture_scores").fetchone()[0]
+
+    def _rebuild_rollups(self):
+        """Recompute all rollups from posture_scores"""
+        last_score_ms = None
+        with self.conn:
+            for resolution in ROLLUP_RESOLUTIONS:
+                self.conn.execute(f"DELETE FROM score_rollup_{resolution}")
+            rows = self.conn.execute(
+                "SELECT timestamp, score FROM posture_scores ORDER BY timestamp"
+            )
+            while True:
+                chunk = rows.fetchmany(10000)
+                if not chunk:
+                    break
+                last_score_ms = self._update_rollups(self.conn, chunk, last_score_ms)
+
+    @staticmethod
+    def _bucket_start(timestamp_ms: int, resolution: str) -> int:
+        if resolution == "minute":
+            # Every UTC offset is a whole number of minutes
+            return timestamp_ms - timestamp_ms % 60000
+        local = datetime.fromtimestamp(timestamp_ms / 1000)
+        if resolution == "hour":
+            local = local.replace(minute=0, second=0, microsecond=0)
+        else:
+            local = local.replace(hour=0, minute=0, second=0, microsecond=0)
+        return int(local.timestamp() * 1000)
+
+    def _update_rollups(self, conn, rows, last_score_ms):
+        """Fold (timestamp, score) rows into the rollup tables.
+
+        ``last_score_ms`` is the newest score already folded in on this
+        connection. Returns the newest after these rows, which the caller
+        keeps once the transaction has committed.
+        """
+        buckets = {resolution: {} for resolution in ROLLUP_RESOLUTIONS}
+        for timestamp, score in sorted(rows):
+            duration = 0
+            if last_score_ms is not None:
+                duration = min(
+                    max(timestamp - last_score_ms, 0), self.max_sample_gap_ms
+                )
+            last_score_ms = timestamp
+            below_ms = duration if score < self.poor_posture_threshold else 0
+
+            for resolution in ROLLUP_RESOLUTIONS:
+                bucket = self._bucket_start(timestamp, resolution)
+                stats = buckets[resolution].get(bucket)
+                if stats is None:
+                    buckets[resolution][bucket] = [1, score, score, score, below_ms]
+                else:
+                    stats[0] += 1
+                    stats[1] += score
+                    stats[2] = min(stats[2], score)
+                    stats[3] = max(stats[3], score)
+                    stats[4] += below_ms
+
+        for resolution, stats in buckets.items():
+            conn.executemany(
+                f"INSERT INTO score_rollup_{resolution} VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (bucket) DO UPDATE SET "
+                "count = count + excluded.count, "
+                "total = total + excluded.total, "
+                "min = MIN(min, excluded.min), "
+                "max = MAX(max, excluded.max), "
+                "below_ms = below_ms + excluded.below_ms",
+                [(bucket, *values) for bucket, values in stats.items()],
+            )
+        return last_score_ms
+
+    def _table_exists(self, table_name: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table_name,),
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _iso_to_epoch_ms(timestamp):
+        """Epoch ms for an original-schema timestamp, or None if unreadable"""
+        # The original schema stored naive local-time ISO strings
+        try:
+            return int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+        except (TypeError, ValueError):
+            return None
+
+    def _migrate_v0(self):
+        """Convert the original one-row-per-landmark layout in place.
+
+        Runs as one transaction, so a failure or crash part way leaves the
+        original tables untouched. Rows whose timestamp cannot be read are
+        skipped.
+        """
+        logger.info("db_migration", extra={"fields": {"path": str(self.db_path)}})
+        landmark_order = {lm.name: i for i, lm in enumerate(self.posture_landmarks)}
+        conn = self.conn
+        skipped = 0
+
+        def scores():
+            nonlocal skipped
+            for timestamp, score in conn.execute(
+                "SELECT timestamp, score FROM posture_scores_v0"
+            ):
+                timestamp_ms = self._iso_to_epoch_ms(timestamp)
+                if timestamp_ms is None:
+                    skipped += 1
+                    continue
+                yield timestamp_ms, score
+
+        def snapshots():
+            nonlocal skipped
+            rows = conn.execute(
+                "SELECT timestamp, landmark_name, x, y, z, visibility "
+                "FROM pose_landmarks_v0 ORDER BY timestamp"
+            )
+            for timestamp, group in groupby(rows, key=lambda row: row[0]):
+                timestamp_ms = self._iso_to_epoch_ms(timestamp)
+                if timestamp_ms is None:
+                    skipped += 1
+                    continue
+                # Landmarks missing from a snapshot are stored as NaN
+                packed = np.full(
+                    (len(landmark_order), LANDMARK_FIELDS), np.nan, np.float32
+                )
+                for _, name, *values in group:
+                    if name in landmark_order:
+                        packed[landmark_order[name]] = values
+                yield timestamp_ms, packed.tobytes()
+
+        # The sqlite3 module only opens transactions for DML and would
+        # autocommit the renames, so the transaction is managed by hand
+        isolation_level = conn.isolation_level
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN")
+            conn.execute("ALTER TABLE posture_scores RENAME TO posture_scores_v0")
+            conn.execute("ALTER TABLE pose_landmarks RENAME TO pose_landmarks_v0")
+            conn.execute("CREATE TABLE posture_scores (timestamp INTEGER, score FLOAT)")
+            conn.execute(
+                "CREATE TABLE pose_landmarks (timestamp INTEGER, landmarks BLOB)"
+            )
+            conn.executemany("INSERT INTO posture_scores VALUES (?, ?)", scores())
+            conn.executemany("INSERT INTO pose_landmarks VALUES (?, ?)", snapshots())
+            conn.execute("DROP TABLE posture_scores_v0")
+            conn.execute("DROP TABLE pose_landmarks_v0")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.isolation_level = isolation_level
+        if skipped:
+            logger.warning(
+                "db_migration_skipped_rows", extra={"fields": {"rows": skipped}}
+            )
+        conn.execute("VACUUM")
+
     def create_table(self, table_name: str, columns: list[tuple[str, str]]):
         self.cursor.execute(
             f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join([f'{col[0]} {col[1]}' for col in columns])})"
@@ -41,34 +299,229 @@ class DBManager:
         self.conn.commit()
 
     def insert(self, table_name: str, values: list[tuple]):
+        with self.conn:
+            last_score_ms = self._insert_rows(
+                self.conn, table_name, values, self._last_score_ms
+            )
+        self._last_score_ms = last_score_ms
+
+    def _insert_rows(self, conn, table_name: str, values: list[tuple], last_score_ms):
+        """Insert without committing; returns the new last score time"""
         placeholders = ", ".join(["?" for _ in values[0]])
-        self.cursor.executemany(
+        conn.executemany(
             f"INSERT INTO {table_name} VALUES ({placeholders})",
             values,
         )
-        self.conn.commit()
+        if table_name == "posture_scores":
+            last_score_ms = self._update_rollups(conn, values, last_score_ms)
+        return last_score_ms
+
+    def insert_async(self, table_name: str, values: list[tuple]):
+        """Queue rows for the writer thread; drops them if the queue is full"""
+        try:
+            self._queue.put_nowait((table_name, values))
+        except Full:
+            self.dropped_rows += len(values)
+            if metrics.enabled:
+                metrics.increment("db.rows_dropped", len(values))
 
     def save_pose_data(self, landmarks, score):
-        timestamp = datetime.now().isoformat()
+        timestamp = int(time.time() * 1000)
 
         # Save overall score
-        self.insert("posture_scores", [(timestamp, score)])
-
-        # Save landmark positions with names
-        landmark_data = []
-        for landmark_enum in self.posture_landmarks:
-            landmark = landmarks.landmark[landmark_enum]
-            landmark_data.append(
-                (
-                    timestamp,
-                    landmark_enum.name,
-                    landmark.x,
-                    landmark.y,
-                    landmark.z,
-                    landmark.visibility,
-                )
-            )
-        self.insert("pose_landmarks", landmark_data)
+        self.insert_async("posture_scores", [(timestamp, score)])
+
+        # Save the posture landmarks as one packed row
+        packed = np.array(
+            [
+                (lm.x, lm.y, lm.z, lm.visibility)
+                for lm in (landmarks.landmark[i] for i in self.posture_landmarks)
+            ],
+            dtype=np.float32,
+        )
+        self.insert_async("pose_landmarks", [(timestamp, packed.tobytes())])
+
+    def read_scores(self, start_ms: int = None, end_ms: int = None):
+        """Return (timestamps, scores) arrays for the given epoch-ms range.
+
+        Rows still queued for the writer are not included; call flush() first
+        if they need to be.
+        """
+        rows = self.conn.execute(
+            "SELECT timestamp, score FROM posture_scores "
+            "WHERE timestamp >= ? AND timestamp <= ? ORDER BY timestamp",
+            self._range(start_ms, end_ms),
+        ).fetchall()
+        data = np.array(rows, dtype=np.float64).reshape(-1, 2)
+        return data[:, 0].astype(np.int64), data[:, 1]
+
+    def read_landmarks(
+        self, start_ms: int = None, end_ms: int = None, full_skeleton=False
+    ):
+        """Return (timestamps, landmarks) arrays for the given epoch-ms range.
+
+        landmarks has shape (N, len(POSTURE_LANDMARKS), 4) holding x, y, z and
+        visibility. With full_skeleton it is scattered into MediaPipe's
+        (N, 33, 4) layout, NaN where nothing was stored, ready for
+        posture_score.score_poses.
+        """
+        rows = self.conn.execute(
+            "SELECT timestamp, landmarks FROM pose_landmarks "
+            "WHERE timestamp >= ? AND timestamp <= ? ORDER BY timestamp",
+            self._range(start_ms, end_ms),
+        ).fetchall()
+        timestamps = np.array([row[0] for row in rows], dtype=np.int64)
+        landmarks = np.frombuffer(
+            b"".join(row[1] for row in rows), dtype=np.float32
+        ).reshape(-1, len(self.posture_landmarks), LANDMARK_FIELDS)
+
+        if full_skeleton:
+            full = np.full((len(rows), 33, LANDMARK_FIELDS), np.nan, np.float32)
+            full[:, [int(lm) for lm in self.posture_landmarks]] = landmarks
+            landmarks = full
+        return timestamps, landmarks
+
+    def get_score_rollup(
+        self, start_ms: int = None, end_ms: int = None, resolution: str = "auto"
+    ):
+        """Return (resolution, rows) of score aggregates for an epoch-ms range.
+
+        rows is a structured array with ROLLUP_DTYPE fields, one entry per
+        bucket that starts inside the range. "auto" picks minutes for up to
+        six hours, hours for up to two weeks and days beyond that.
+        """
+        if resolution == "auto":
+            resolution = self._auto_resolution(start_ms, end_ms)
+        rows = self.conn.execute(
+            f"SELECT bucket, count, total / count, min, max, below_ms "
+            f"FROM score_rollup_{resolution} "
+            "WHERE bucket >= ? AND bucket <= ? ORDER BY bucket",
+            self._range(start_ms, end_ms),
+        ).fetchall()
+        return resolution, np.array(rows, dtype=ROLLUP_DTYPE)
+
+    def get_score_summary(self, start_ms: int = None, end_ms: int = None):
+        """Return count, mean, min, max and below_ms over an epoch-ms range"""
+        resolution = self._auto_resolution(start_ms, end_ms)
+        count, total, low, high, below_ms = self.conn.execute(
+            "SELECT SUM(count), SUM(total), MIN(min), MAX(max), SUM(below_ms) "
+            f"FROM score_rollup_{resolution} WHERE bucket >= ? AND bucket <= ?",
+            self._range(start_ms, end_ms),
+        ).fetchone()
+        return {
+            "count": count or 0,
+            "mean": total / count if count else 0.0,
+            "min": low,
+            "max": high,
+            "below_ms": below_ms or 0,
+        }
+
+    @staticmethod
+    def _auto_resolution(start_ms, end_ms):
+        if start_ms is None:
+            return "day"
+        span = (time.time() * 1000 if end_ms is None else end_ms) - start_ms
+        if span <= 6 * 3600 * 1000:
+            return "minute"
+        if span <= 14 * 24 * 3600 * 1000:
+            return "hour"
+        return "day"
+
+    @staticmethod
+    def _range(start_ms, end_ms):
+        return (
+            -(2**63) if start_ms is None else start_ms,
+            2**63 - 1 if end_ms is None else end_ms,
+        )
+
+    def flush(self, timeout: float = None):
+        """Block until everything queued so far has been committed.
+
+        Returns False on timeout, or straight away if the writer has stopped
+        with rows still queued.
+        """
+        if not self._writer.is_alive():
+            return self._queue.empty()
+        done = Event()
+        self._queue.put(done)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Poll so a writer stopped by a concurrent close() cannot strand us
+        while True:
+            wait = 0.1
+            if deadline is not None:
+                wait = min(wait, max(deadline - time.monotonic(), 0))
+            if done.wait(wait):
+                return True
+            if not self._writer.is_alive():
+                return done.is_set()
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def _writer_loop(self):
+        conn = self._connect()
+        last_score_ms = self._committed_last_score_ms(conn)
+        pending = {}  # table name -> rows
+        pending_count = 0
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.time())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            flush_done = None
+            if isinstance(item, tuple):
+                table_name, values = item
+                pending.setdefault(table_name, []).extend(values)
+                pending_count += len(values)
+                if deadline is None:
+                    deadline = time.time() + self.flush_interval
+            elif isinstance(item, Event):
+                flush_done = item
+
+            if pending and (
+                item is None
+                or item is _STOP
+                or flush_done is not None
+                or pending_count >= self.batch_size
+            ):
+                last_score_ms = self._write_batch(conn, pending, last_score_ms)
+                pending = {}
+                pending_count = 0
+                deadline = None
+
+            if flush_done is not None:
+                flush_done.set()
+            if item is _STOP:
+                break
+
+        conn.close()
+
+    def _write_batch(self, conn, pending, last_score_ms):
+        """Commit pending rows in one transaction; returns the last score time"""
+        start = time.perf_counter_ns() if metrics.enabled else 0
+        committed = last_score_ms
+        try:
+            with conn:  # one transaction for the whole batch
+                for table_name, rows in pending.items():
+                    last_score_ms = self._insert_rows(
+                        conn, table_name, rows, last_score_ms
+                    )
+        except sqlite3.Error as e:
+            logger.error("db_write_error", extra={"fields": {"error": str(e)}})
+            if start:
+                metrics.increment("db.write_errors")
+            # Rolled back, so the next batch measures from the last commit
+            return committed
+        if start:
+            metrics.observe("db.write_batch", time.perf_counter_ns() - start)
+            metrics.increment("db.rows_written", sum(map(len, pending.values())))
+        return last_score_ms
 
     def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
         self.conn.close()
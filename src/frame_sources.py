@@ -0,0 +1,212 @@
+import logging
+import os
+import platform
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("posture_tracker")
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+class FrameSource(ABC):
+    """Something Webcam can pull BGR frames from.
+
+    ``open`` returns False if the source is unavailable, ``read`` returns
+    ``(ok, frame)`` like cv2.VideoCapture and ``(False, None)`` once the
+    source is exhausted. Each frame belongs to the caller, which may draw on
+    it, so ``read`` must not hand out an array it will reuse.
+    """
+
+    def open(self) -> bool:
+        return True
+
+    @abstractmethod
+    def read(self):
+        """Return ``(ok, frame)``"""
+
+    def release(self) -> None:
+        pass
+
+
+class CameraSource(FrameSource):
+    """Live camera with the capture format negotiated up front.
+
+    Asks the driver for a compressed format (MJPG by default) at the size the
+    detector analyzes, so frames arrive without a YUYV decode of a larger
+    mode followed by a resize, and for a single-frame driver queue so each
+    read returns the newest frame rather than one several frames old. Drivers
+    may ignore any of these; the values actually in effect are kept in
+    ``negotiated``.
+    """
+
+    def __init__(
+        self, camera_id=0, width=1280, height=720, fps=30, fourcc="MJPG", buffer_size=1
+    ):
+        self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.negotiated = {}
+        self.cap = None
+
+    def open(self) -> bool:
+        # V4L2 directly rather than via GStreamer, which adds its own queue
+        backend = cv2.CAP_V4L2 if platform.system() == "Linux" else cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(self.camera_id, backend)
+        if not self.cap.isOpened():
+            self.cap = None
+            return False
+
+        # V4L2 only applies the pixel format if it is set before the size
+        if self.fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width and self.height:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_size:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+
+        fourcc = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.negotiated = {
+            "fourcc": "".join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4)),
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": self.cap.get(cv2.CAP_PROP_FPS),
+        }
+        if (self.negotiated["width"], self.negotiated["height"]) != (
+            self.width,
+            self.height,
+        ):
+            logger.warning(
+                "camera_resolution_mismatch",
+                extra={
+                    "fields": {
+                        "requested": f"{self.width}x{self.height}",
+                        "negotiated": f"{self.negotiated['width']}x"
+                        f"{self.negotiated['height']}",
+                    }
+                },
+            )
+        return True
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self) -> None:
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, loop=False):
+        self.path = str(path)
+        self.loop = loop
+        self.cap = None
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.path)
+        return self.cap.isOpened()
+
+    def read(self):
+        ok, frame = self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        return ok, frame
+
+    def release(self) -> None:
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageDirectorySource(FrameSource):
+    """Images in a directory, in file name order"""
+
+    def __init__(self, directory, loop=False):
+        self.directory = Path(directory)
+        self.loop = loop
+        self.paths = []
+        self._index = 0
+
+    def open(self) -> bool:
+        if not self.directory.is_dir():
+            return False
+        self.paths = sorted(
+            p for p in self.directory.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES
+        )
+        self._index = 0
+        return bool(self.paths)
+
+    def read(self):
+        while self._index < len(self.paths) or (self.loop and self.paths):
+            if self._index >= len(self.paths):
+                self._index = 0
+            frame = cv2.imread(str(self.paths[self._index]))
+            self._index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+
+class SyntheticSource(FrameSource):
+    """Endless random frames for running the pipeline without a camera.
+
+    Cycles through a small pool of pre-generated frames so generating them
+    does not show up in timings. Each read returns a copy, as a camera would
+    return a fresh frame, so overlays drawn on one frame never reach the pool.
+    """
+
+    def __init__(self, width=1280, height=720, pool_size=8, seed=0):
+        self.width = width
+        self.height = height
+        self.pool_size = pool_size
+        self.seed = seed
+        self._pool = []
+        self._index = 0
+
+    def open(self) -> bool:
+        rng = np.random.default_rng(self.seed)
+        self._pool = [
+            rng.integers(0, 256, (self.height, self.width, 3), dtype=np.uint8)
+            for _ in range(self.pool_size)
+        ]
+        self._index = 0
+        return True
+
+    def read(self):
+        frame = self._pool[self._index % self.pool_size]
+        self._index += 1
+        return True, frame.copy()
+
+    def release(self) -> None:
+        self._pool = []
+
+
+def create_source(spec, width=1280, height=720, fps=30, loop=False) -> FrameSource:
+    """Build a source from a command line value.
+
+    A number is a camera index, ``synthetic`` or ``synthetic:WxH`` is the
+    generator, a directory is replayed as images and anything else is opened
+    as a video file. ``width`` and ``height`` are the size requested from
+    cameras and generated by the synthetic source.
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return CameraSource(int(spec), width=width, height=height, fps=fps)
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        if ":" in spec:
+            width, height = (int(v) for v in spec.split(":", 1)[1].lower().split("x"))
+        return SyntheticSource(width, height)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop)
@@ -0,0 +1,229 @@
+import ctypes
+import ctypes.util
+import gc
+import json
+import logging
+import os
+from bisect import bisect_left
+from threading import Event, Lock, Thread
+from time import time
+
+logger = logging.getLogger("posture_tracker")
+
+# Upper bounds in nanoseconds: 10 µs to ~42 s, doubling, plus overflow
+BUCKET_BOUNDS_NS = tuple(10_000 * 2**i for i in range(23))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram.
+
+    ``observe`` is a bisect and three integer updates, with no allocation.
+    Several threads can feed the same histogram (pool workers, pipelines
+    sharing a stage name), so updates and reads take a lock; uncontended it
+    costs far less than the stages being timed.
+    """
+
+    def __init__(self, bounds=BUCKET_BOUNDS_NS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self._lock = Lock()
+
+    def observe(self, duration_ns):
+        bucket = bisect_left(self.bounds, duration_ns)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.total += duration_ns
+
+    def state(self):
+        """Consistent copy of (counts, count, total)"""
+        with self._lock:
+            return list(self.counts), self.count, self.total
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile, in ns"""
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "mean_ms": self.total / self.count / 1e6 if self.count else 0.0,
+                "p50_ms": self.percentile(50) / 1e6,
+                "p95_ms": self.percentile(95) / 1e6,
+                "p99_ms": self.percentile(99) / 1e6,
+            }
+
+
+class Metrics:
+    """Registry of named histograms and counters.
+
+    Disabled by default. Call sites check ``enabled`` before reading the
+    clock, so a disabled registry costs one attribute lookup::
+
+        start = perf_counter_ns() if metrics.enabled else 0
+        ...
+        if start:
+            metrics.observe("webcam.capture", perf_counter_ns() - start)
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self.counters = {}
+        self.started_at = time()
+        # Guards adding names and counter updates across threads
+        self._lock = Lock()
+
+    def enable(self):
+        if not self.enabled:
+            self.reset()
+            self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.histograms = {}
+        self.counters = {}
+        self.started_at = time()
+
+    def observe(self, name, duration_ns):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        histogram.observe(duration_ns)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def _items(self):
+        with self._lock:
+            return sorted(self.histograms.items()), sorted(self.counters.items())
+
+    def snapshot(self):
+        histograms, counters = self._items()
+        return {
+            "uptime_s": time() - self.started_at,
+            "histograms": {
+                name: histogram.snapshot() for name, histogram in histograms
+            },
+            "counters": dict(counters),
+        }
+
+    def to_prometheus(self, prefix="posture_tracker"):
+        """Prometheus text exposition format; durations in seconds"""
+        lines = []
+        histograms, counters = self._items()
+        for name, histogram in histograms:
+            metric = f"{prefix}_{name.replace('.', '_')}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            counts, total_count, total = histogram.state()
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound / 1e9:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {total_count}')
+            lines.append(f"{metric}_sum {total / 1e9:.9f}")
+            lines.append(f"{metric}_count {total_count}")
+        for name, value in counters:
+            metric = f"{prefix}_{name.replace('.', '_')}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def format_summary(self):
+        """Short human-readable table for the tray"""
+        snapshot = self.snapshot()
+        lines = [f"Collecting for {snapshot['uptime_s'] / 60:.1f} min"]
+        for name, stats in snapshot["histograms"].items():
+            lines.append(
+                f"{name}: {stats['count']} × {stats['mean_ms']:.1f} ms "
+                f"(p95 ≤{stats['p95_ms']:.1f} ms)"
+            )
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+
+metrics = Metrics()
+
+
+def rss_bytes():
+    """Resident set size of this process"""
+    import psutil
+
+    return psutil.Process().memory_info().rss
+
+
+def release_memory():
+    """Collect garbage and hand freed heap pages back to the OS.
+
+    glibc keeps freed memory in its arenas, so RSS only drops after
+    malloc_trim; elsewhere this is just a gc pass.
+    """
+    gc.collect()
+    libc_name = ctypes.util.find_library("c")
+    if libc_name:
+        try:
+            ctypes.CDLL(libc_name).malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+class StatsExporter:
+    """Periodically writes the metrics to a file.
+
+    A ``.prom`` suffix selects the Prometheus text format (suitable for the
+    node_exporter textfile collector), anything else gets JSON. Files are
+    replaced atomically so readers never see a partial write.
+    """
+
+    def __init__(self, path, interval=10.0, registry=metrics):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        self.registry.enable()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self):
+        if self.path.endswith(".prom"):
+            content = self.registry.to_prometheus()
+        else:
+            content = json.dumps(self.registry.snapshot(), indent=2)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(content)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error("stats_write_error", extra={"fields": {"error": str(e)}})
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.write()
@@ -0,0 +1,65 @@
+from math import pi
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """One Euro filter (Casiez et al., CHI 2012) over a whole landmark array.
+
+    Every coordinate gets its own adaptive low-pass filter: the cutoff
+    frequency rises with the coordinate's speed, so a still pose is smoothed
+    heavily while real movement comes through with little lag. All
+    coordinates are updated in one set of array operations, and the
+    smoothing factors come from the actual time between samples, so
+    irregular frame spacing (rate scheduler, motion gate) is handled.
+
+    Speeds are in normalized frame units per second. After a gap longer than
+    ``max_gap`` seconds the filter starts over rather than blending in stale
+    positions; callers that sample slowly on purpose should raise it to
+    their longest expected spacing.
+
+    The default ``min_cutoff`` is meant for the ~1 Hz a still pose is
+    sampled at: a 1 Hz cutoff would pass nearly every 1 Hz sample through
+    unchanged. Movement raises the cutoff through ``beta``, and raises the
+    inference rate too, so the low floor costs little lag.
+    """
+
+    def __init__(self, min_cutoff=0.1, beta=5.0, d_cutoff=1.0, max_gap=2.0):
+        self.min_cutoff = min_cutoff  # Hz at zero speed
+        self.beta = beta  # cutoff increase per unit of speed
+        self.d_cutoff = d_cutoff  # Hz for the speed estimate itself
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self._value = None
+        self._speed = None
+        self._timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """Filter one sample; ``points`` is any float array, e.g. (33, 3)"""
+        points = np.asarray(points, dtype=np.float64)
+        if self._value is None or timestamp - self._timestamp > self.max_gap:
+            self._value = points.copy()
+            self._speed = np.zeros_like(points)
+            self._timestamp = timestamp
+            return self._value.copy()
+
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            # Duplicate or out-of-order timestamp; nothing to integrate over
+            return self._value.copy()
+        self._timestamp = timestamp
+
+        speed = (points - self._value) / dt
+        self._speed += self._alpha(self.d_cutoff, dt) * (speed - self._speed)
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self._speed)
+        alpha = 1.0 / (1.0 + 1.0 / (2 * pi * cutoff * dt))
+        self._value += alpha * (points - self._value)
+        return self._value.copy()
@@ -1,9 +1,14 @@
+import argparse
 import os
 import sys
 
 import psutil
 from PyQt6.QtWidgets import QApplication
 
+from cli_options import detector_options, source_options, stats_options
+from daemon import configure_logging
+from frame_sources import create_source
+from instrumentation import StatsExporter
 from tray_application import PostureTrackerTray
 
 
@@ -30,8 +35,18 @@ def kill_existing_instance(lock_file):
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Posture tracker tray application",
+        parents=[source_options(), detector_options(), stats_options()],
+    )
+    # Leave Qt's own command line options to QApplication
+    args, _ = parser.parse_known_args()
+    # Camera, detector and database messages go through the daemon's logger
+    configure_logging()
+
     app = QApplication(sys.argv)
 
+    stats_exporter = None
     lock_file = os.path.join(os.path.expanduser("~"), ".posture_tracker.lock")
 
     if os.path.exists(lock_file):
@@ -42,10 +57,20 @@ def main():
             f.write(str(os.getpid()))
 
         app.setQuitOnLastWindowClosed(False)
-        tray = PostureTrackerTray()  # noqa: F841
+        tray = PostureTrackerTray(  # noqa: F841
+            out_of_process=args.out_of_process,
+            source=create_source(args.source),
+            auto_quality=not args.fixed_quality,
+            roi_tracking=args.roi_tracking,
+        )
+        if args.stats_file:
+            stats_exporter = StatsExporter(args.stats_file, args.stats_interval)
+            stats_exporter.start()
         exit_code = app.exec()
 
     finally:
+        if stats_exporter:
+            stats_exporter.stop()
         if os.path.exists(lock_file):
             os.remove(lock_file)
 
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Decides whether a frame differs enough from the last analyzed one.
+
+    Frames are shrunk to a tiny grayscale thumbnail and compared by mean
+    absolute difference against the thumbnail of the last frame that was
+    actually sent to the pose model.
+    """
+
+    def __init__(self, threshold=2.0, max_skipped=30, size=(64, 36)):
+        self.threshold = threshold  # mean absolute difference, 0-255 scale
+        self.max_skipped = max_skipped  # force an inference after this many skips
+        self.size = size
+        self.skipped = 0
+        self.analyzed = 0
+        self._consecutive_skips = 0
+
+        width, height = size
+        self._small = np.empty((height, width, 3), dtype=np.uint8)
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        self._diff = np.empty((height, width), dtype=np.uint8)
+        self._reference = None
+
+    def should_process(self, frame: np.ndarray) -> bool:
+        """Return True if the frame needs inference, False to reuse the last result"""
+        cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        if self._reference is not None and self._consecutive_skips < self.max_skipped:
+            cv2.absdiff(self._gray, self._reference, dst=self._diff)
+            if cv2.mean(self._diff)[0] < self.threshold:
+                self._consecutive_skips += 1
+                self.skipped += 1
+                return False
+
+        if self._reference is None:
+            self._reference = self._gray.copy()
+        else:
+            np.copyto(self._reference, self._gray)
+        self._consecutive_skips = 0
+        self.analyzed += 1
+        return True
+
+    def reset(self):
+        """Forget the reference frame so the next frame is always analyzed"""
+        self._reference = None
+        self._consecutive_skips = 0
+        self.skipped = 0
+        self.analyzed = 0
+
+    def get_stats(self):
+        return {"skipped": self.skipped, "analyzed": self.analyzed}
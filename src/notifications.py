@@ -2,6 +2,8 @@ import os
 import platform
 import time
 
+from instrumentation import metrics
+
 
 class NotificationManager:
     def __init__(self):
@@ -20,8 +22,14 @@ class NotificationManager:
             posture_score < self.poor_posture_threshold
             and current_time - self.last_notification_time > self.notification_cooldown
         ):
+            start = time.perf_counter_ns() if metrics.enabled else 0
             self.send_notification()
             self.last_notification_time = current_time
+            if start:
+                metrics.observe(
+                    "notifications.dispatch", time.perf_counter_ns() - start
+                )
+                metrics.increment("notifications.sent")
 
     def send_notification(self):
         title = "Posture Alert!"
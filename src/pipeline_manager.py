@@ -0,0 +1,277 @@
+"""Several camera pipelines sharing a bounded pool of pose detectors.
+
+Run from the ``src`` directory:
+
+    python pipeline_manager.py --source 0 --source 2 --workers 2 --db-dir data
+"""
+
+import argparse
+import os
+import signal
+import time
+from queue import Queue
+from threading import Event, Thread
+
+import cli_options
+from daemon import ResultRecorder, configure_logging, logger
+from db_manager import DBManager
+from frame_sources import create_source
+from instrumentation import StatsExporter, metrics
+from motion_gate import MotionGate
+from rate_scheduler import AdaptiveRateScheduler
+from webcam import Webcam
+
+
+class _Request:
+    __slots__ = ("frame", "timestamp", "done", "result", "queued_at")
+
+    def __init__(self, frame, timestamp):
+        self.frame = frame
+        self.timestamp = timestamp
+        self.done = Event()
+        self.result = None
+        self.queued_at = time.perf_counter_ns() if metrics.enabled else 0
+
+
+class InferencePool:
+    """A fixed number of detectors shared by any number of pipelines.
+
+    ``process_frame`` has the Webcam callback signature and blocks until a
+    worker has handled the frame. Requests are served first in, first out,
+    and each pipeline's inference thread has at most one request queued, so
+    pipelines take turns and a busy camera cannot starve the others. While a
+    pipeline waits, its Webcam keeps only the newest captured frame, which is
+    the back-pressure: extra frames are dropped at the camera, not queued.
+
+    Detectors are built with ``detector_factory``. Pooled detectors see
+    frames from different cameras, so they should not track poses across
+    frames (static_image_mode, no ROI tracking, no landmark filter).
+    """
+
+    def __init__(self, detector_factory, workers=2):
+        self._queue = Queue()
+        self.detectors = [detector_factory() for _ in range(workers)]
+        for detector in self.detectors:
+            detector.render_overlay = False
+        self._workers = [
+            Thread(target=self._worker_loop, args=(detector,), daemon=True)
+            for detector in self.detectors
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def process_frame(self, frame, timestamp=None):
+        request = _Request(frame, timestamp)
+        self._queue.put(request)
+        request.done.wait()
+        if isinstance(request.result, Exception):
+            raise request.result
+        return request.result
+
+    @property
+    def queued(self):
+        return self._queue.qsize()
+
+    def _worker_loop(self, detector):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            if request.queued_at:
+                metrics.observe(
+                    "pool.queue_wait", time.perf_counter_ns() - request.queued_at
+                )
+            try:
+                request.result = detector.process_frame(
+                    request.frame, request.timestamp
+                )
+            except Exception as e:
+                request.result = e
+            request.done.set()
+
+    def close(self):
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        for detector in self.detectors:
+            detector.close()
+
+
+class Pipeline:
+    """One camera's capture → shared detect → history → DB chain"""
+
+    def __init__(self, name, source, pool, db_path=None, db_save_interval=60):
+        self.name = name
+        self.rate_scheduler = AdaptiveRateScheduler(min_fps=1, max_fps=30)
+        self.frame_reader = Webcam(
+            rate_scheduler=self.rate_scheduler,
+            motion_gate=MotionGate(),
+            result_callback=self.on_analysis_result,
+            source=source,
+        )
+        self.pool = pool
+        self.db = DBManager(db_path) if db_path else None
+        self.recorder = ResultRecorder(
+            self.rate_scheduler, db=self.db, db_save_interval=db_save_interval
+        )
+        self.scores = self.recorder.scores
+
+    def start(self):
+        return self.frame_reader.start(callback=self.pool.process_frame)
+
+    def stop(self):
+        self.frame_reader.stop()
+        if self.db:
+            self.db.close()
+
+    @property
+    def running(self):
+        return self.frame_reader.is_running.is_set()
+
+    def on_analysis_result(self, frame, score, results, timestamp):
+        self.recorder.record(score, results, timestamp)
+
+    def get_stats(self):
+        return {
+            "average": round(self.scores.get_average_score(), 1),
+            "interval_s": round(self.rate_scheduler.interval, 3),
+            **self.frame_reader.get_stats(),
+        }
+
+
+class PipelineManager:
+    """Runs pipelines against one InferencePool until stopped"""
+
+    def __init__(self, pool, log_interval=10):
+        self.pool = pool
+        self.pipelines = {}
+        self.log_interval = log_interval
+        self._stop_event = Event()
+        self._signum = None
+
+    def add_pipeline(self, name, source, db_path=None, db_save_interval=60):
+        if name in self.pipelines:
+            raise ValueError(f"Pipeline {name!r} already exists")
+        pipeline = Pipeline(name, source, self.pool, db_path, db_save_interval)
+        self.pipelines[name] = pipeline
+        return pipeline
+
+    def run(self):
+        """Start every pipeline and wait for stop() or all sources to end"""
+        started = [p for p in self.pipelines.values() if p.start()]
+        for pipeline in self.pipelines.values():
+            if pipeline not in started:
+                logger.error(
+                    "source_unavailable", extra={"fields": {"pipeline": pipeline.name}}
+                )
+        if not started:
+            self.shutdown()
+            return False
+        logger.info(
+            "started",
+            extra={
+                "fields": {
+                    "pipelines": len(started),
+                    "workers": len(self.pool.detectors),
+                }
+            },
+        )
+
+        last_log = time.time()
+        while not self._stop_event.wait(0.5):
+            if not any(p.running for p in started):
+                logger.info("sources_ended")
+                break
+            if time.time() - last_log >= self.log_interval:
+                last_log = time.time()
+                self.log_stats()
+        if self._signum is not None:
+            logger.info("signal", extra={"fields": {"signum": self._signum}})
+        self.shutdown()
+        return True
+
+    def log_stats(self):
+        logger.info("pool", extra={"fields": {"queued": self.pool.queued}})
+        for pipeline in self.pipelines.values():
+            logger.info(
+                "score",
+                extra={"fields": {"pipeline": pipeline.name, **pipeline.get_stats()}},
+            )
+
+    def stop(self, signum=None, frame=None):
+        """Safe to call from a signal handler; run() logs and cleans up"""
+        self._signum = signum
+        self._stop_event.set()
+
+    def shutdown(self):
+        # Pipelines first so no inference thread is left waiting on the pool
+        for pipeline in self.pipelines.values():
+            pipeline.stop()
+        self.pool.close()
+        self.log_stats()
+        logger.info("stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        parents=[
+            cli_options.source_options(multiple=True),
+            cli_options.detector_options(fixed_quality=False, roi_tracking=False),
+            cli_options.headless_options(),
+            cli_options.stats_options(),
+        ],
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+        help="detectors shared by all pipelines (default: half the cores, max 4)",
+    )
+    parser.add_argument("--db-dir", help="write one database per pipeline here")
+    args = parser.parse_args()
+
+    configure_logging(args.log_format)
+    detector_kwargs = {"static_image_mode": True}
+    if args.out_of_process:
+        from pose_worker import ProcessPoseDetector
+
+        def detector_factory():
+            return ProcessPoseDetector(**detector_kwargs)
+
+    else:
+        from pose_detector import PoseDetector
+
+        def detector_factory():
+            return PoseDetector(**detector_kwargs)
+
+    manager = PipelineManager(
+        InferencePool(detector_factory, workers=args.workers),
+        log_interval=args.log_interval,
+    )
+    if args.db_dir:
+        os.makedirs(args.db_dir, exist_ok=True)
+    for i, spec in enumerate(args.source):
+        name = f"cam{i}"
+        db_path = os.path.join(args.db_dir, f"{name}.db") if args.db_dir else None
+        manager.add_pipeline(
+            name, create_source(spec), db_path, db_save_interval=args.db_save_interval
+        )
+    signal.signal(signal.SIGINT, manager.stop)
+    signal.signal(signal.SIGTERM, manager.stop)
+
+    stats_exporter = None
+    if args.stats_file:
+        stats_exporter = StatsExporter(args.stats_file, args.stats_interval)
+        stats_exporter.start()
+    try:
+        ok = manager.run()
+    finally:
+        if stats_exporter:
+            stats_exporter.stop()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
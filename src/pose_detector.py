@@ -1,10 +1,19 @@
+import logging
+from threading import Lock, Thread
+from time import perf_counter_ns, time
 from typing import Tuple
 
 import cv2
-import mediapipe as mp
 import numpy as np
 
-from pose_landmarks import POSTURE_LANDMARKS
+import posture_score
+from instrumentation import metrics
+from pose_landmarks import POSTURE_LANDMARKS, PoseLandmark
+
+logger = logging.getLogger("posture_tracker")
+
+# Resolution of the grid ROI boxes are snapped to, per axis
+ROI_GRID = 16
 
 
 class PoseDetector:
@@ -12,71 +21,404 @@ class PoseDetector:
         self,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5,
+        model_complexity=1,
+        static_image_mode=False,
         frame_width=1280,
         frame_height=720,
+        inference_width=None,
+        inference_height=None,
+        roi_tracking=False,
+        roi_padding=0.25,
+        roi_min_visibility=0.5,
+        roi_min_size=0.1,
+        landmark_filter=None,
+        load_model=True,
     ):
+        # Display size is what gets drawn on and returned; inference size is
+        # what MediaPipe sees. Landmarks are normalized so the two can differ.
         self.frame_width = frame_width
         self.frame_height = frame_height
-        self.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        self.mp_pose = mp.solutions.pose
-        self.mp_draw = mp.solutions.drawing_utils
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence,
-            model_complexity=1,  # Use the most detailed model
+        self.clahe = None
+        self.set_inference_size(
+            inference_width or frame_width, inference_height or frame_height
         )
+        # MediaPipe takes about a second to import, so it is only imported
+        # once a model is loaded or landmarks are drawn
+        self._landmark_spec = None
+        self._connection_spec = None
+        # When False, process_frame only analyzes and returns the input frame
+        # as is; the overlay is only worth drawing while someone watches it
+        self.render_overlay = True
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity  # 0 lite, 1 full, 2 heavy
+        # True treats every frame on its own instead of tracking the pose
+        # from the previous one, for detectors shared between cameras
+        self.static_image_mode = static_image_mode
+        # Without a model the detector can still resize, score and draw,
+        # e.g. in the GUI process when inference runs out of process
+        self.pose = None
+        self._loader = None
+        # Held while a model is built, so a frame arriving before the
+        # background loader runs cannot build a second one
+        self._model_lock = Lock()
+        if load_model:
+            self.load_model()
         self.posture_landmarks = POSTURE_LANDMARKS
+        self._posture_indices = np.array([int(lm) for lm in POSTURE_LANDMARKS])
+
+        # ROI tracking crops inference to the box around the previous frame's
+        # landmarks; self.roi is None whenever a full-frame detection is needed
+        self.roi_tracking = roi_tracking
+        self.roi_padding = roi_padding  # fraction of box size added per side
+        self.roi_min_visibility = roi_min_visibility
+        self.roi_min_size = roi_min_size  # smallest box side, normalized
+        self.roi = None
+
+        # Optional temporal filter (e.g. OneEuroFilter) applied to the
+        # landmarks in place before scoring, drawing and storage
+        self.landmark_filter = landmark_filter
+
+        # Per-instance copies so weights can be tuned without side effects
+        self.ideal_neck_vector = posture_score.IDEAL_NECK_VECTOR.copy()
+        self.ideal_spine_vector = posture_score.IDEAL_SPINE_VECTOR.copy()
+        self.weights = posture_score.DEFAULT_WEIGHTS.copy()
+        self.score_thresholds = dict(posture_score.DEFAULT_THRESHOLDS)
+
+    @property
+    def mp_pose(self):
+        from mediapipe.python.solutions import pose
+
+        return pose
+
+    @property
+    def mp_draw(self):
+        from mediapipe.python.solutions import drawing_utils
+
+        return drawing_utils
+
+    def load_model(self) -> None:
+        """Load the model unless another thread already has"""
+        with self._model_lock:
+            if self.pose is None:
+                self.pose = self._create_model()
+
+    def _create_model(self):
+        return self.mp_pose.Pose(
+            static_image_mode=self.static_image_mode,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+            model_complexity=self.model_complexity,
+        )
 
-        # Pre-calculate the ideal vectors once
-        self.ideal_neck_vector = np.array([0, -1, 0])
-        self.ideal_spine_vector = np.array([0, -1, 0])
-
-        # Pre-calculate constants for performance
-        self.weights = np.array([0.2, 0.2, 0.15, 0.15, 0.15, 0.1, 0.05])
-        self.score_thresholds = {
-            "head_tilt": 1.2,  # head forward threshold
-            "neck_angle": 45.0,  # max neck angle
-            "shoulder_level": 5.0,  # shoulder level threshold
-            "shoulder_roll": 2.0,  # shoulder roll threshold
-            "spine_angle": 45.0,  # max spine angle
-        }
-
-    def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, float, any]:
-        # Resize frame to a consistent size for better performance
-        # Height of 720p maintains good detail while being computationally efficient
-        frame = cv2.resize(frame, (1280, 720))
-
-        # Apply adaptive histogram equalization to improve contrast in different lighting
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-        l_channel, a_channel, b_channel = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        l_channel = clahe.apply(l_channel)
-        enhanced = cv2.merge([l_channel, a_channel, b_channel])
-        enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
-
-        # Convert to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(enhanced, cv2.COLOR_BGR2RGB)
+    def load_model_async(self, warm_up: bool = True) -> None:
+        """Import MediaPipe and load the model on a background thread.
+
+        With ``warm_up``, one blank frame is run through the graph so the
+        first real frame does not pay for its initialization. analyze_frame
+        waits for the loader if it is still running.
+        """
+        if self.pose is not None or self._loader is not None:
+            return
+        self._loader = Thread(target=self._load_in_background, args=(warm_up,))
+        self._loader.daemon = True
+        self._loader.start()
+
+    def _load_in_background(self, warm_up: bool) -> None:
+        try:
+            with self._model_lock:
+                if self.pose is not None:
+                    return
+                pose = self._create_model()
+                if warm_up:
+                    blank = np.zeros(
+                        (self.inference_height, self.inference_width, 3),
+                        dtype=np.uint8,
+                    )
+                    pose.process(blank)
+                # Published only once warm, so no frame shares the graph
+                # with the warm-up run
+                self.pose = pose
+        except Exception as e:
+            logger.error("pose_model_load_error", extra={"fields": {"error": str(e)}})
+
+    def wait_for_model(self, timeout: float = None) -> bool:
+        """Block until a background load finishes; True if a model is loaded"""
+        loader = self._loader
+        if loader is not None:
+            loader.join(timeout)
+            if loader.is_alive():
+                return False
+            self._loader = None
+        return self.pose is not None
+
+    def close(self) -> None:
+        self.wait_for_model()
+        with self._model_lock:
+            if self.pose is not None:
+                self.pose.close()
+                self.pose = None
+
+    def suspend(self) -> None:
+        """Free the model, CLAHE state and work buffers until resume().
+
+        analyze_frame brings everything back on its own if called first.
+        """
+        self.close()
+        self.clahe = None
+        self._buffer_size = self._view_size = None
+        self._buffers = None
+        self._inference_bgr = self._lab = self._l_channel = self._rgb = None
+        self.roi = None
+        if self.landmark_filter is not None:
+            self.landmark_filter.reset()
+
+    def resume(self, warm_up: bool = True) -> None:
+        """Reallocate buffers and start loading the model in the background"""
+        if self._buffer_size is None:
+            self._allocate_buffers(self.inference_width, self.inference_height)
+        self.load_model_async(warm_up)
+
+    def set_quality(self, model_complexity: int, width: int, height: int) -> None:
+        """Switch model complexity and inference size, reloading if needed.
+
+        If the new model fails to load the previous one is restored and the
+        error re-raised; MediaPipe downloads the lite and heavy models on
+        first use, which fails offline.
+        """
+        if model_complexity != self.model_complexity:
+            previous = self.model_complexity
+            self.model_complexity = model_complexity
+            if self.wait_for_model():
+                self.close()
+                try:
+                    self.load_model()
+                except Exception:
+                    self.model_complexity = previous
+                    self.load_model()
+                    raise
+        if (width, height) != (self.inference_width, self.inference_height):
+            self.set_inference_size(width, height)
+            self.roi = None
+
+    def set_inference_size(self, width: int, height: int) -> None:
+        """Set the resolution fed to MediaPipe and (re)allocate work buffers."""
+        self.inference_width = width
+        self.inference_height = height
+        self._allocate_buffers(width, height)
+
+    def _allocate_buffers(self, width: int, height: int) -> None:
+        # Preallocated buffers reused every frame via dst=, so the
+        # preprocessing stage does not allocate once warmed up. They are flat
+        # and sized for the full inference frame; smaller ROI crops work in
+        # contiguous views of their start, so a new crop size allocates nothing
+        if self.clahe is None:
+            self.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+        self._buffer_size = (width, height)
+        pixels = width * height
+        self._buffers = (
+            np.empty(pixels * 3, dtype=np.uint8),
+            np.empty(pixels * 3, dtype=np.uint8),
+            np.empty(pixels, dtype=np.uint8),
+            np.empty(pixels * 3, dtype=np.uint8),
+        )
+        self._set_views(width, height)
+
+    def _set_views(self, width: int, height: int) -> None:
+        """Point the work arrays at the start of the buffers, shaped for this size"""
+        pixels = width * height
+        bgr, lab, l_channel, rgb = self._buffers
+        self._view_size = (width, height)
+        self._inference_bgr = bgr[: pixels * 3].reshape(height, width, 3)
+        self._lab = lab[: pixels * 3].reshape(height, width, 3)
+        self._l_channel = l_channel[:pixels].reshape(height, width)
+        self._rgb = rgb[: pixels * 3].reshape(height, width, 3)
+
+    def process_frame(
+        self, frame: np.ndarray, timestamp: float = None
+    ) -> Tuple[np.ndarray, float, any]:
+        # Analysis always sees the full captured frame, so the display size
+        # can be smaller than the inference size
+        score, results = self.analyze_frame(frame, timestamp)
+        if not self.render_overlay:
+            return frame, score, results
+
+        start = perf_counter_ns() if metrics.enabled else 0
+        frame = self.resize_for_display(frame)
+        self.draw_overlay(frame, score, results)
+        if start:
+            metrics.observe("detector.overlay", perf_counter_ns() - start)
+        return frame, score, results
+
+    def draw_overlay(self, frame: np.ndarray, score: float, results) -> None:
+        """Draw landmarks and the score onto a display frame in place."""
+        if results:
+            self._draw_landmarks(frame, results)
+            self._draw_posture_feedback(frame, score)
+
+    def analyze_frame(
+        self, frame: np.ndarray, timestamp: float = None
+    ) -> Tuple[float, any]:
+        """Run inference and scoring only; the frame is left untouched.
+
+        ``timestamp`` is when the frame was captured, in seconds; the
+        landmark filter uses it so inference latency does not skew its
+        timing. Defaults to now.
+        """
+        if self.pose is None and not self.wait_for_model():
+            self.load_model()
+        timed = metrics.enabled
+        if timed:
+            start = perf_counter_ns()
+        roi = self.roi if self.roi_tracking else None
+        if roi is None:
+            rgb_frame = self.preprocess(frame)
+        else:
+            rgb_frame = self._preprocess_roi(frame, roi)
+        if timed:
+            now = perf_counter_ns()
+            metrics.observe("detector.preprocess", now - start)
+            start = now
 
         results = self.pose.process(rgb_frame)
+        if timed:
+            now = perf_counter_ns()
+            metrics.observe("detector.inference", now - start)
+            start = now
+
+        if results.pose_landmarks and roi is not None:
+            self._roi_to_frame_coords(results.pose_landmarks, roi)
+        if self.roi_tracking:
+            self._update_roi(results.pose_landmarks)
+
+        if not results.pose_landmarks:
+            if timed:
+                metrics.increment("detector.no_pose")
+            if self.landmark_filter is not None:
+                self.landmark_filter.reset()
+            return 0.0, None
+        if self.landmark_filter is not None:
+            self._smooth_landmarks(
+                results.pose_landmarks, time() if timestamp is None else timestamp
+            )
+        score = self._calculate_posture_score(results.pose_landmarks)
+        if timed:
+            metrics.observe("detector.scoring", perf_counter_ns() - start)
+        return score, results
+
+    def resize_for_display(self, frame: np.ndarray) -> np.ndarray:
+        """Resize to the display size, skipping the copy if already there."""
+        # The returned frame is drawn on and handed to other threads, so it
+        # gets a fresh array rather than a reused buffer
+        if frame.shape[1] == self.frame_width and frame.shape[0] == self.frame_height:
+            return frame
+        return cv2.resize(frame, (self.frame_width, self.frame_height))
+
+    def preprocess(self, frame: np.ndarray, size=None) -> np.ndarray:
+        """Turn a captured BGR frame into the contrast-enhanced RGB model input.
+
+        ``size`` defaults to the inference size and may not exceed it. The
+        returned array is an internal buffer that is overwritten by the next
+        call.
+        """
+        if self._buffer_size != (self.inference_width, self.inference_height):
+            self._allocate_buffers(self.inference_width, self.inference_height)
+        size = size or self._buffer_size
+        if size != self._view_size:
+            self._set_views(*size)
+        small = self._resize_for_inference(frame)
+        self._equalize(small)
+        return self._to_rgb()
+
+    def _resize_for_inference(self, frame: np.ndarray) -> np.ndarray:
+        width, height = self._view_size
+        if frame.shape[1] == width and frame.shape[0] == height:
+            return frame
+        # INTER_AREA avoids aliasing when shrinking the captured frame
+        return cv2.resize(
+            frame,
+            (width, height),
+            dst=self._inference_bgr,
+            interpolation=cv2.INTER_AREA,
+        )
 
-        if results.pose_landmarks:
-            self._draw_landmarks(frame, results)
-            posture_score = self._calculate_posture_score(results.pose_landmarks)
-            self._draw_posture_feedback(frame, posture_score)
-            return frame, posture_score, results
-        return frame, 0.0, None
+    def _preprocess_roi(self, frame: np.ndarray, roi) -> np.ndarray:
+        # Crop in captured-frame pixels and keep the inference scale, so the
+        # crop is processed at the same detail as a full frame but with fewer
+        # pixels
+        x0, y0, x1, y1 = roi
+        h, w = frame.shape[:2]
+        crop = frame[int(y0 * h) : int(y1 * h), int(x0 * w) : int(x1 * w)]
+        size = (
+            max(1, round((x1 - x0) * self.inference_width)),
+            max(1, round((y1 - y0) * self.inference_height)),
+        )
+        return self.preprocess(crop, size)
+
+    @staticmethod
+    def _roi_to_frame_coords(pose_landmarks, roi) -> None:
+        """Map landmarks normalized to the ROI back onto the full frame."""
+        x0, y0, x1, y1 = roi
+        roi_width, roi_height = x1 - x0, y1 - y0
+        for lm in pose_landmarks.landmark:
+            lm.x = x0 + lm.x * roi_width
+            lm.y = y0 + lm.y * roi_height
+            # z shares the scale of x
+            lm.z = lm.z * roi_width
+
+    def _update_roi(self, pose_landmarks) -> None:
+        """Derive the next frame's ROI, or clear it to force full-frame detection."""
+        self.roi = None
+        if not pose_landmarks:
+            return
+
+        landmarks = pose_landmarks.landmark
+        points = np.array(
+            [
+                (landmarks[i].x, landmarks[i].y, landmarks[i].visibility)
+                for i in self._posture_indices
+            ]
+        )
+        if points[:, 2].mean() < self.roi_min_visibility:
+            return
+
+        lo = points[:, :2].min(axis=0)
+        hi = points[:, :2].max(axis=0)
+        pad = (hi - lo) * self.roi_padding
+        # Snap to a 1/16 grid so the crop size, and with it the buffers,
+        # only change when the person actually moves
+        lo = np.clip(np.floor((lo - pad) * ROI_GRID) / ROI_GRID, 0.0, 1.0)
+        hi = np.clip(np.ceil((hi + pad) * ROI_GRID) / ROI_GRID, 0.0, 1.0)
+        if np.any(hi - lo < self.roi_min_size):
+            return
+        self.roi = (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
+    def _equalize(self, frame: np.ndarray) -> None:
+        # Apply adaptive histogram equalization to the lightness channel only
+        # to improve contrast in different lighting
+        cv2.cvtColor(frame, cv2.COLOR_BGR2LAB, dst=self._lab)
+        cv2.extractChannel(self._lab, 0, dst=self._l_channel)
+        self.clahe.apply(self._l_channel, dst=self._l_channel)
+        cv2.insertChannel(self._l_channel, self._lab, 0)
+
+    def _to_rgb(self) -> np.ndarray:
+        # LAB converts straight to RGB for MediaPipe, no BGR round trip
+        return cv2.cvtColor(self._lab, cv2.COLOR_LAB2RGB, dst=self._rgb)
 
     def _draw_landmarks(self, frame: np.ndarray, results) -> None:
+        if self._landmark_spec is None:
+            self._landmark_spec = self.mp_draw.DrawingSpec(
+                color=(0, 255, 0), thickness=2, circle_radius=2
+            )
+            self._connection_spec = self.mp_draw.DrawingSpec(
+                color=(255, 255, 255), thickness=2
+            )
         self.mp_draw.draw_landmarks(
             frame,
             results.pose_landmarks,
             self.mp_pose.POSE_CONNECTIONS,
-            landmark_drawing_spec=self.mp_draw.DrawingSpec(
-                color=(0, 255, 0), thickness=2, circle_radius=2
-            ),
-            connection_drawing_spec=self.mp_draw.DrawingSpec(
-                color=(255, 255, 255), thickness=2
-            ),
+            landmark_drawing_spec=self._landmark_spec,
+            connection_drawing_spec=self._connection_spec,
         )
 
         if results.pose_landmarks:
@@ -86,13 +428,13 @@ class PoseDetector:
             mid_hip = np.array(
                 [
                     (
-                        landmarks[self.mp_pose.PoseLandmark.LEFT_HIP].x
-                        + landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP].x
+                        landmarks[PoseLandmark.LEFT_HIP].x
+                        + landmarks[PoseLandmark.RIGHT_HIP].x
                     )
                     / 2,
                     (
-                        landmarks[self.mp_pose.PoseLandmark.LEFT_HIP].y
-                        + landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP].y
+                        landmarks[PoseLandmark.LEFT_HIP].y
+                        + landmarks[PoseLandmark.RIGHT_HIP].y
                     )
                     / 2,
                 ]
@@ -100,13 +442,13 @@ class PoseDetector:
             mid_shoulder = np.array(
                 [
                     (
-                        landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER].x
-                        + landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER].x
+                        landmarks[PoseLandmark.LEFT_SHOULDER].x
+                        + landmarks[PoseLandmark.RIGHT_SHOULDER].x
                     )
                     / 2,
                     (
-                        landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER].y
-                        + landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER].y
+                        landmarks[PoseLandmark.LEFT_SHOULDER].y
+                        + landmarks[PoseLandmark.RIGHT_SHOULDER].y
                     )
                     / 2,
                 ]
@@ -137,94 +479,32 @@ class PoseDetector:
 
         return np.degrees(np.arccos(dot_product))
 
-    def _calculate_posture_score(self, landmarks) -> float:
-        # Vectorized point extraction - more efficient than individual access
-        landmark_points = np.array([[lm.x, lm.y, lm.z] for lm in landmarks.landmark])
-
-        # Get all relevant points in one go using array indexing
-        nose = landmark_points[self.mp_pose.PoseLandmark.NOSE]
-        ears = landmark_points[
-            [self.mp_pose.PoseLandmark.LEFT_EAR, self.mp_pose.PoseLandmark.RIGHT_EAR]
-        ]
-        shoulders = landmark_points[
-            [
-                self.mp_pose.PoseLandmark.LEFT_SHOULDER,
-                self.mp_pose.PoseLandmark.RIGHT_SHOULDER,
-            ]
-        ]
-        hips = landmark_points[
-            [self.mp_pose.PoseLandmark.LEFT_HIP, self.mp_pose.PoseLandmark.RIGHT_HIP]
-        ]
-
-        # Efficient midpoint calculations using numpy operations
-        mid_ear = np.mean(ears, axis=0)
-        mid_shoulder = np.mean(shoulders, axis=0)
-        mid_hip = np.mean(hips, axis=0)
-
-        # Vectorized score calculations
-        head_forward_offset = nose[2] - mid_ear[2]
-        head_tilt_score = np.clip(
-            1 - abs(head_forward_offset) * self.score_thresholds["head_tilt"], 0, 1
-        )
-
-        neck_vector = mid_ear - mid_shoulder
-        neck_angle = self.angle_between(neck_vector, self.ideal_neck_vector)
-        neck_vertical_score = np.clip(
-            1 - abs(neck_angle) / self.score_thresholds["neck_angle"], 0, 1
-        )
-
-        # Efficient shoulder calculations
-        shoulder_diff = shoulders[0] - shoulders[1]  # left - right
-        shoulder_scores = np.array(
-            [
-                np.clip(
-                    1 - abs(shoulder_diff[1]) * self.score_thresholds["shoulder_level"],
-                    0,
-                    1,
-                ),  # level
-                np.clip(
-                    1 - abs(shoulder_diff[2]) * self.score_thresholds["shoulder_roll"],
-                    0,
-                    1,
-                ),  # roll
-            ]
-        )
-
-        spine_vector = mid_shoulder - mid_hip
-        spine_angle = self.angle_between(spine_vector, self.ideal_spine_vector)
-        spine_alignment_score = np.clip(
-            1 - abs(spine_angle) / self.score_thresholds["spine_angle"], 0, 1
-        )
-
-        # Efficient head rotation calculation
-        ear_distance = np.linalg.norm(ears[1] - ears[0])  # right - left
-        shoulder_width = np.linalg.norm(shoulders[1] - shoulders[0])
-        ideal_ear_distance = shoulder_width * 0.7
-
-        head_rotation_score = np.clip(
-            1 - abs(ear_distance - ideal_ear_distance) / (ideal_ear_distance + 1e-6),
-            0,
-            1,
+    def score_batch(self, landmarks: np.ndarray):
+        """Score an ``(N, 33, 3|4)`` landmark array with this detector's weights.
+
+        Returns the ``(N,)`` final scores and ``(N, 7)`` metric components.
+        """
+        return posture_score.score_poses(
+            landmarks,
+            self.weights,
+            self.score_thresholds,
+            self.ideal_neck_vector,
+            self.ideal_spine_vector,
         )
 
-        head_side_tilt_score = np.clip(1 - abs(ears[0][1] - ears[1][1]) * 5, 0, 1)
+    def _smooth_landmarks(self, pose_landmarks, timestamp: float) -> None:
+        landmarks = pose_landmarks.landmark
+        points = np.array([(lm.x, lm.y, lm.z) for lm in landmarks])
+        smoothed = self.landmark_filter(points, timestamp)
+        for lm, (x, y, z) in zip(landmarks, smoothed.tolist()):
+            lm.x, lm.y, lm.z = x, y, z
 
-        # Vectorized final score calculation
-        scores = np.array(
-            [
-                head_tilt_score,
-                neck_vertical_score,
-                shoulder_scores[0],
-                shoulder_scores[1],
-                spine_alignment_score,
-                head_rotation_score,
-                head_side_tilt_score,
-            ]
+    def _calculate_posture_score(self, landmarks) -> float:
+        landmark_points = np.array(
+            [[(lm.x, lm.y, lm.z) for lm in landmarks.landmark]], dtype=np.float32
         )
-
-        final_score = np.clip(np.dot(scores, self.weights) * 100, 0, 100)
-
-        return final_score
+        scores, _ = self.score_batch(landmark_points)
+        return float(scores[0])
 
     def _draw_posture_feedback(self, frame: np.ndarray, score: float) -> None:
         score_color = (
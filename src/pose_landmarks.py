@@ -1,25 +1,62 @@
-import mediapipe as mp
+from enum import IntEnum
+
+
+class PoseLandmark(IntEnum):
+    """MediaPipe's pose landmark indices, without importing MediaPipe"""
+
+    NOSE = 0
+    LEFT_EYE_INNER = 1
+    LEFT_EYE = 2
+    LEFT_EYE_OUTER = 3
+    RIGHT_EYE_INNER = 4
+    RIGHT_EYE = 5
+    RIGHT_EYE_OUTER = 6
+    LEFT_EAR = 7
+    RIGHT_EAR = 8
+    MOUTH_LEFT = 9
+    MOUTH_RIGHT = 10
+    LEFT_SHOULDER = 11
+    RIGHT_SHOULDER = 12
+    LEFT_ELBOW = 13
+    RIGHT_ELBOW = 14
+    LEFT_WRIST = 15
+    RIGHT_WRIST = 16
+    LEFT_PINKY = 17
+    RIGHT_PINKY = 18
+    LEFT_INDEX = 19
+    RIGHT_INDEX = 20
+    LEFT_THUMB = 21
+    RIGHT_THUMB = 22
+    LEFT_HIP = 23
+    RIGHT_HIP = 24
+    LEFT_KNEE = 25
+    RIGHT_KNEE = 26
+    LEFT_ANKLE = 27
+    RIGHT_ANKLE = 28
+    LEFT_HEEL = 29
+    RIGHT_HEEL = 30
+    LEFT_FOOT_INDEX = 31
+    RIGHT_FOOT_INDEX = 32
 
-mp_pose = mp.solutions.pose
 
 POSTURE_LANDMARKS = [
-    mp_pose.PoseLandmark.NOSE,
-    mp_pose.PoseLandmark.LEFT_EYE_INNER,
-    mp_pose.PoseLandmark.LEFT_EYE,
-    mp_pose.PoseLandmark.LEFT_EYE_OUTER,
-    mp_pose.PoseLandmark.RIGHT_EYE_INNER,
-    mp_pose.PoseLandmark.RIGHT_EYE,
-    mp_pose.PoseLandmark.RIGHT_EYE_OUTER,
-    mp_pose.PoseLandmark.LEFT_EAR,
-    mp_pose.PoseLandmark.RIGHT_EAR,
-    mp_pose.PoseLandmark.MOUTH_LEFT,
-    mp_pose.PoseLandmark.MOUTH_RIGHT,
-    mp_pose.PoseLandmark.LEFT_SHOULDER,
-    mp_pose.PoseLandmark.RIGHT_SHOULDER,
-    mp_pose.PoseLandmark.LEFT_ELBOW,
-    mp_pose.PoseLandmark.RIGHT_ELBOW,
-    mp_pose.PoseLandmark.LEFT_WRIST,
-    mp_pose.PoseLandmark.RIGHT_WRIST,
-    mp_pose.PoseLandmark.LEFT_HIP,
-    mp_pose.PoseLandmark.RIGHT_HIP,
+    PoseLandmark.NOSE,
+    PoseLandmark.LEFT_EYE_INNER,
+    PoseLandmark.LEFT_EYE,
+    PoseLandmark.LEFT_EYE_OUTER,
+    PoseLandmark.RIGHT_EYE_INNER,
+    PoseLandmark.RIGHT_EYE,
+    PoseLandmark.RIGHT_EYE_OUTER,
+    PoseLandmark.LEFT_EAR,
+    PoseLandmark.RIGHT_EAR,
+    PoseLandmark.MOUTH_LEFT,
+    PoseLandmark.MOUTH_RIGHT,
+    PoseLandmark.LEFT_SHOULDER,
+    PoseLandmark.RIGHT_SHOULDER,
+    PoseLandmark.LEFT_ELBOW,
+    PoseLandmark.RIGHT_ELBOW,
+    PoseLandmark.LEFT_WRIST,
+    PoseLandmark.RIGHT_WRIST,
+    PoseLandmark.LEFT_HIP,
+    PoseLandmark.RIGHT_HIP,
 ]
@@ -0,0 +1,309 @@
+import logging
+import multiprocessing as mp
+from collections import namedtuple
+from multiprocessing import shared_memory
+from time import monotonic
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+from pose_detector import PoseDetector
+
+logger = logging.getLogger("posture_tracker")
+
+# Stand-in for MediaPipe's results object; callers only use pose_landmarks
+PoseResults = namedtuple("PoseResults", ["pose_landmarks"])
+
+
+def _worker_main(conn, shm_name, slot_bytes, detector_kwargs):
+    """Entry point of the inference process.
+
+    The first message is ``("ready", None)`` once the model has loaded, or
+    ``("error", message)`` if it could not be. Requests are then
+    ``(seq, slot, shape, timestamp)`` tuples pointing into the shared memory
+    ring, with the frame's capture time;
+    replies are ``(seq, score, landmarks)`` where landmarks is a ``(33, 4)``
+    float32 array of x, y, z, visibility or None.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        detector = PoseDetector(**detector_kwargs)
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        shm.close()
+        return
+    conn.send(("ready", None))
+    try:
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            seq, slot, shape, timestamp = request
+            frame = np.ndarray(
+                shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes
+            )
+            score, results = detector.analyze_frame(frame, timestamp)
+            landmarks = None
+            if results:
+                landmarks = np.array(
+                    [
+                        (lm.x, lm.y, lm.z, lm.visibility)
+                        for lm in results.pose_landmarks.landmark
+                    ],
+                    dtype=np.float32,
+                )
+            # Drop our view before the next request can reuse the slot
+            del frame
+            conn.send((seq, float(score), landmarks))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        detector.close()
+        shm.close()
+
+
+class ProcessPoseDetector:
+    """Runs PoseDetector inference in a separate process.
+
+    Frames are copied into a ring of shared memory slots instead of being
+    pickled, and only the score and landmarks come back. Drawing happens in
+    the calling process with a model-less PoseDetector. A worker that dies
+    or stops answering is restarted on the next frame. One that fails to load
+    its model is retried after ``retry_delay`` seconds, doubling up to
+    ``max_retry_delay``; frames in between fail at once instead of each
+    waiting out ``startup_timeout``. Both kinds of respawn count in
+    ``restarts``.
+    """
+
+    def __init__(
+        self,
+        slots=2,
+        max_width=1920,
+        max_height=1080,
+        timeout=5.0,
+        startup_timeout=30.0,
+        retry_delay=1.0,
+        max_retry_delay=60.0,
+        **detector_kwargs,
+    ):
+        self.slots = slots
+        self.max_width = max_width
+        self.max_height = max_height
+        self.slot_bytes = max_width * max_height * 3
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.detector_kwargs = detector_kwargs
+        self.renderer = PoseDetector(load_model=False, **detector_kwargs)
+        self.render_overlay = True
+        self.restarts = 0
+
+        # spawn keeps Qt and camera threads out of the child
+        self._context = mp.get_context("spawn")
+        self._shm = None
+        self._process = None
+        self._conn = None
+        self._next_slot = 0
+        self._seq = 0
+        self._ready = False
+        self._warm = False
+        self._start_failures = 0
+        self._retry_at = 0.0
+
+    def start(self, wait=False):
+        """Spawn the worker; with ``wait``, block until its model has loaded"""
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=self.slots * self.slot_bytes
+            )
+        parent_conn, child_conn = self._context.Pipe()
+        self._conn = parent_conn
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self._shm.name, self.slot_bytes, self.detector_kwargs),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._ready = False
+        self._warm = False
+        if wait:
+            self._wait_ready()
+
+    def _wait_ready(self):
+        """Raise RuntimeError if the worker could not load its model"""
+        if self._ready:
+            return
+        message = None
+        try:
+            if self._conn.poll(self.startup_timeout):
+                message = self._conn.recv()
+        except (EOFError, ConnectionResetError):
+            pass
+        if message is None or message[0] != "ready":
+            self._stop_process()
+            self._start_failures += 1
+            delay = self.retry_delay * 2 ** (self._start_failures - 1)
+            self._retry_at = monotonic() + min(delay, self.max_retry_delay)
+            reason = message[1] if message else "exited or timed out while loading"
+            raise RuntimeError(f"Pose worker failed to start: {reason}")
+        self._ready = True
+        self._start_failures = 0
+
+    def load_model_async(self, warm_up=True):
+        """Spawn the worker now; it loads the model while the caller goes on"""
+        if self._process is None:
+            self.start()
+
+    @property
+    def model_complexity(self):
+        return self.detector_kwargs.get("model_complexity", 1)
+
+    @property
+    def inference_width(self):
+        return self.detector_kwargs.get(
+            "inference_width", self.renderer.inference_width
+        )
+
+    @property
+    def inference_height(self):
+        return self.detector_kwargs.get(
+            "inference_height", self.renderer.inference_height
+        )
+
+    def set_quality(self, model_complexity, width, height):
+        """Restart a running worker with new settings and wait for its model.
+
+        As with PoseDetector.set_quality, if the new model fails to load the
+        previous settings are restored and the error re-raised.
+        """
+        previous = dict(self.detector_kwargs)
+        self.detector_kwargs.update(
+            model_complexity=model_complexity,
+            inference_width=width,
+            inference_height=height,
+        )
+        if self._process is None:
+            return
+        self._stop_process()
+        try:
+            self.start(wait=True)
+        except Exception:
+            self.detector_kwargs = previous
+            self.start()
+            raise
+
+    def suspend(self):
+        """Stop the worker and free the shared memory until the next frame"""
+        self.close()
+
+    def resume(self, warm_up=True):
+        self.load_model_async(warm_up)
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def restart(self):
+        self.restarts += 1
+        logger.warning(
+            "pose_worker_restart", extra={"fields": {"restarts": self.restarts}}
+        )
+        self._stop_process()
+        self.start()
+
+    def process_frame(
+        self, frame: np.ndarray, timestamp: float = None
+    ) -> Tuple[np.ndarray, float, any]:
+        if self._process is None:
+            if self._start_failures:
+                wait = self._retry_at - monotonic()
+                if wait > 0:
+                    raise RuntimeError(
+                        f"Pose worker failed to start, retrying in {wait:.0f}s"
+                    )
+                self.restarts += 1
+            self.start()
+        elif not self.is_alive():
+            self.restart()
+
+        score, landmarks = self._analyze(frame, timestamp)
+        results = None
+        if landmarks is not None:
+            results = PoseResults(self._to_landmark_list(landmarks))
+        if self.render_overlay:
+            frame = self.renderer.resize_for_display(frame)
+            self.renderer.draw_overlay(frame, score, results)
+        return frame, score, results
+
+    def _analyze(self, frame: np.ndarray, timestamp: float = None):
+        # Raises instead of respawning a worker whose model cannot load
+        self._wait_ready()
+        if frame.shape[0] > self.max_height or frame.shape[1] > self.max_width:
+            scale = min(
+                self.max_width / frame.shape[1], self.max_height / frame.shape[0]
+            )
+            frame = cv2.resize(
+                frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.slots
+        view = np.ndarray(
+            frame.shape,
+            dtype=np.uint8,
+            buffer=self._shm.buf,
+            offset=slot * self.slot_bytes,
+        )
+        np.copyto(view, frame)
+        del view
+
+        self._seq += 1
+        seq = self._seq
+        timeout = self.timeout if self._warm else self.startup_timeout
+        try:
+            self._conn.send((seq, slot, frame.shape, timestamp))
+            while self._conn.poll(timeout):
+                reply_seq, score, landmarks = self._conn.recv()
+                if reply_seq == seq:
+                    self._warm = True
+                    return score, landmarks
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            pass
+
+        # Crashed or hung; the caller gets an empty result for this frame
+        self.restart()
+        return 0.0, None
+
+    @staticmethod
+    def _to_landmark_list(landmarks: np.ndarray):
+        from mediapipe.framework.formats import landmark_pb2
+
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, visibility in landmarks.tolist():
+            landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
+        return landmark_list
+
+    def _stop_process(self):
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        if self._process is not None:
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def close(self):
+        self._stop_process()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
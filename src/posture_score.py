@@ -0,0 +1,96 @@
+import numpy as np
+
+from pose_landmarks import PoseLandmark
+
+NOSE = int(PoseLandmark.NOSE)
+EARS = [int(PoseLandmark.LEFT_EAR), int(PoseLandmark.RIGHT_EAR)]
+SHOULDERS = [int(PoseLandmark.LEFT_SHOULDER), int(PoseLandmark.RIGHT_SHOULDER)]
+HIPS = [int(PoseLandmark.LEFT_HIP), int(PoseLandmark.RIGHT_HIP)]
+
+# Order of the per-metric components returned by score_poses
+COMPONENT_NAMES = (
+    "head_tilt",
+    "neck_vertical",
+    "shoulder_level",
+    "shoulder_roll",
+    "spine_alignment",
+    "head_rotation",
+    "head_side_tilt",
+)
+
+DEFAULT_WEIGHTS = np.array([0.2, 0.2, 0.15, 0.15, 0.15, 0.1, 0.05])
+DEFAULT_THRESHOLDS = {
+    "head_tilt": 1.2,  # head forward threshold
+    "neck_angle": 45.0,  # max neck angle
+    "shoulder_level": 5.0,  # shoulder level threshold
+    "shoulder_roll": 2.0,  # shoulder roll threshold
+    "spine_angle": 45.0,  # max spine angle
+}
+IDEAL_NECK_VECTOR = np.array([0, -1, 0])
+IDEAL_SPINE_VECTOR = np.array([0, -1, 0])
+
+
+def angles_between(vectors: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Angle in degrees between each row of ``vectors`` and ``reference``.
+
+    Rows shorter than 1e-6 get an angle of 0, like PoseDetector.angle_between.
+    """
+    norms = np.linalg.norm(vectors, axis=-1)
+    reference_norm = np.linalg.norm(reference)
+    valid = (norms >= 1e-6) & (reference_norm >= 1e-6)
+    cosines = (vectors @ reference) / np.where(valid, norms * reference_norm, 1.0)
+    angles = np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0)))
+    return np.where(valid, angles, 0.0)
+
+
+def score_poses(
+    landmarks: np.ndarray,
+    weights: np.ndarray = DEFAULT_WEIGHTS,
+    thresholds: dict = DEFAULT_THRESHOLDS,
+    ideal_neck_vector: np.ndarray = IDEAL_NECK_VECTOR,
+    ideal_spine_vector: np.ndarray = IDEAL_SPINE_VECTOR,
+):
+    """Score a batch of poses.
+
+    ``landmarks`` is an ``(N, 33, 3)`` or ``(N, 33, 4)`` array of x, y, z
+    (and visibility, which is ignored). Returns the ``(N,)`` final scores in
+    0-100 and the ``(N, 7)`` per-metric components in 0-1, ordered as in
+    COMPONENT_NAMES.
+    """
+    points = landmarks[..., :3]
+    nose = points[:, NOSE]
+    ears = points[:, EARS]
+    shoulders = points[:, SHOULDERS]
+    hips = points[:, HIPS]
+
+    mid_ear = ears.mean(axis=1)
+    mid_shoulder = shoulders.mean(axis=1)
+    mid_hip = hips.mean(axis=1)
+
+    components = np.empty((len(points), len(COMPONENT_NAMES)), dtype=points.dtype)
+
+    head_forward_offset = nose[:, 2] - mid_ear[:, 2]
+    components[:, 0] = 1 - np.abs(head_forward_offset) * thresholds["head_tilt"]
+
+    neck_angle = angles_between(mid_ear - mid_shoulder, ideal_neck_vector)
+    components[:, 1] = 1 - np.abs(neck_angle) / thresholds["neck_angle"]
+
+    shoulder_diff = shoulders[:, 0] - shoulders[:, 1]  # left - right
+    components[:, 2] = 1 - np.abs(shoulder_diff[:, 1]) * thresholds["shoulder_level"]
+    components[:, 3] = 1 - np.abs(shoulder_diff[:, 2]) * thresholds["shoulder_roll"]
+
+    spine_angle = angles_between(mid_shoulder - mid_hip, ideal_spine_vector)
+    components[:, 4] = 1 - np.abs(spine_angle) / thresholds["spine_angle"]
+
+    ear_distance = np.linalg.norm(ears[:, 1] - ears[:, 0], axis=-1)  # right - left
+    shoulder_width = np.linalg.norm(shoulders[:, 1] - shoulders[:, 0], axis=-1)
+    ideal_ear_distance = shoulder_width * 0.7
+    components[:, 5] = 1 - np.abs(ear_distance - ideal_ear_distance) / (
+        ideal_ear_distance + 1e-6
+    )
+
+    components[:, 6] = 1 - np.abs(ears[:, 0, 1] - ears[:, 1, 1]) * 5
+
+    np.clip(components, 0, 1, out=components)
+    scores = np.clip(components @ weights * 100, 0, 100)
+    return scores, components
@@ -0,0 +1,158 @@
+import logging
+from collections import deque
+from time import time
+
+import numpy as np
+
+from instrumentation import metrics
+
+logger = logging.getLogger("posture_tracker")
+
+# (model_complexity, inference width, inference height), cheapest first
+DEFAULT_LADDER = (
+    (0, 640, 360),
+    (0, 960, 540),
+    (1, 960, 540),
+    (1, 1280, 720),
+    (2, 1280, 720),
+)
+
+
+class QualityTuner:
+    """Moves a detector up and down a ladder of quality levels.
+
+    Per-frame latency and system CPU load are compared with their budgets
+    over a window of frames. Going over either budget steps down one level.
+    Stepping up needs both to sit below ``headroom`` times their budget, and
+    a level that went over budget is not retried for ``retry_after``
+    seconds. Together with the cooldowns this hysteresis keeps the level
+    from flapping between two neighbours.
+
+    ``observe`` must be called from the thread that runs the detector, since
+    changing the model complexity reloads the model.
+    """
+
+    def __init__(
+        self,
+        detector,
+        ladder=DEFAULT_LADDER,
+        level=None,
+        latency_budget=0.1,  # seconds per frame, at the 90th percentile
+        cpu_budget=75.0,  # percent, system wide
+        headroom=0.6,
+        window=30,  # frames per decision
+        down_cooldown=5.0,  # seconds after any change before stepping down
+        up_cooldown=60.0,  # seconds after any change before stepping up
+        retry_after=300.0,  # seconds before retrying a level that failed
+        cpu_sampler=None,
+    ):
+        self.detector = detector
+        self.ladder = list(ladder)
+        self.latency_budget = latency_budget
+        self.cpu_budget = cpu_budget
+        self.headroom = headroom
+        self.down_cooldown = down_cooldown
+        self.up_cooldown = up_cooldown
+        self.retry_after = retry_after
+        if cpu_sampler is None:
+            import psutil
+
+            # Percent since the previous call, so it never blocks
+            cpu_sampler = psutil.cpu_percent
+        self._cpu_sampler = cpu_sampler
+        self._latencies = deque(maxlen=window)
+        self._cpu = 0.0
+        self._last_cpu_sample = None
+        self._last_change = None
+        self._failed_at = {}  # quality -> when it last failed or went over budget
+
+        current = (
+            getattr(detector, "model_complexity", None),
+            detector.inference_width,
+            detector.inference_height,
+        )
+        if level is None:
+            level = self.ladder.index(current) if current in self.ladder else 0
+        self.level = level
+        if self.ladder[level] != current:
+            self._apply(level)
+
+    @property
+    def quality(self):
+        """The current (model_complexity, width, height)"""
+        return self.ladder[self.level]
+
+    def observe(self, latency, now=None):
+        """Feed one frame's processing time in seconds"""
+        now = time() if now is None else now
+        self._latencies.append(latency)
+        if self._last_cpu_sample is None or now - self._last_cpu_sample >= 1.0:
+            self._cpu = self._cpu_sampler()
+            self._last_cpu_sample = now
+        if len(self._latencies) < self._latencies.maxlen:
+            return
+
+        since_change = None if self._last_change is None else now - self._last_change
+        p90 = float(np.percentile(self._latencies, 90))
+        over = p90 > self.latency_budget or self._cpu > self.cpu_budget
+        under = (
+            p90 < self.latency_budget * self.headroom
+            and self._cpu < self.cpu_budget * self.headroom
+        )
+
+        if over and self.level > 0:
+            if since_change is None or since_change >= self.down_cooldown:
+                self._failed_at[self.quality] = now
+                self._change(self.level - 1, now, p90)
+        elif under and self.level < len(self.ladder) - 1:
+            failed_at = self._failed_at.get(self.ladder[self.level + 1])
+            if (since_change is None or since_change >= self.up_cooldown) and (
+                failed_at is None or now - failed_at >= self.retry_after
+            ):
+                self._change(self.level + 1, now, p90)
+
+    def _change(self, level, now, p90):
+        complexity, width, height = self.ladder[level]
+        logger.info(
+            "quality_change",
+            extra={
+                "fields": {
+                    "model_complexity": complexity,
+                    "width": width,
+                    "height": height,
+                    "p90_ms": round(p90 * 1000),
+                    "cpu_percent": round(self._cpu),
+                }
+            },
+        )
+        try:
+            self._apply(level)
+        except Exception as e:
+            current = self.ladder[self.level]
+            if complexity != current[0]:
+                # Drop every level using a model that cannot be loaded here
+                logger.warning(
+                    "model_complexity_unavailable",
+                    extra={"fields": {"model_complexity": complexity, "error": str(e)}},
+                )
+                self.ladder = [q for q in self.ladder if q[0] != complexity]
+            else:
+                # Same model, so the failure says nothing about the others;
+                # treat the level like one that went over budget
+                logger.warning(
+                    "quality_change_failed", extra={"fields": {"error": str(e)}}
+                )
+                self._failed_at[self.ladder[level]] = now
+            # The detector kept its settings, so stay on the current level
+            self.level = self.ladder.index(current)
+            self._last_change = now
+            return
+        self._last_change = now
+        # Latencies measured at the old level say nothing about the new one
+        self._latencies.clear()
+        if metrics.enabled:
+            metrics.increment("quality.changes")
+
+    def _apply(self, level):
+        self.detector.set_quality(*self.ladder[level])
+        self.level = level
@@ -0,0 +1,97 @@
+from threading import Lock
+from time import time
+
+import numpy as np
+
+from pose_landmarks import POSTURE_LANDMARKS
+
+
+class AdaptiveRateScheduler:
+    """Picks the inference rate from how much the posture is changing.
+
+    The rate decays towards ``min_fps`` while the score variance and landmark
+    velocity stay below their thresholds, and jumps back to ``max_fps`` as
+    soon as either rises above them.
+    """
+
+    def __init__(
+        self,
+        min_fps=1.0,
+        max_fps=30.0,
+        variance_threshold=25.0,  # score units squared
+        velocity_threshold=0.05,  # normalized frame widths per second
+        half_life=2.0,  # seconds of stability to halve the rate
+    ):
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.variance_threshold = variance_threshold
+        self.velocity_threshold = velocity_threshold
+        self.half_life = half_life
+        self.fps = max_fps
+
+        self._indices = np.array([int(lm) for lm in POSTURE_LANDMARKS])
+        self._score_variance = 0.0
+        self._velocity = 0.0
+        self._last_points = None
+        self._last_points_time = None
+        self._last_update = None
+        # Variance arrives on the UI thread and landmarks on the inference
+        # thread; both update the rate
+        self._lock = Lock()
+
+    @property
+    def interval(self):
+        """Seconds to wait between inferences at the current rate"""
+        return 1.0 / self.fps
+
+    def observe_score_variance(self, variance, now=None):
+        """Feed the current score variance, e.g. from ScoreHistory"""
+        self._score_variance = variance
+        self._update(now)
+
+    def observe_landmarks(self, pose_landmarks, now=None):
+        """Feed the latest landmarks to track how fast the pose is moving"""
+        now = time() if now is None else now
+        if not pose_landmarks:
+            # Nobody in view tells us nothing about motion
+            self._last_points = None
+            return
+
+        landmarks = pose_landmarks.landmark
+        points = np.array([(landmarks[i].x, landmarks[i].y) for i in self._indices])
+        if self._last_points is not None and now > self._last_points_time:
+            displacement = np.linalg.norm(points - self._last_points, axis=1).mean()
+            self._velocity = displacement / (now - self._last_points_time)
+        self._last_points = points
+        self._last_points_time = now
+        self._update(now)
+
+    def reset(self):
+        """Go back to full rate, e.g. when tracking restarts"""
+        with self._lock:
+            self.fps = self.max_fps
+            self._velocity = 0.0
+            self._score_variance = 0.0
+            self._last_points = None
+            self._last_update = None
+
+    def _update(self, now=None):
+        now = time() if now is None else now
+        with self._lock:
+            if self._last_update is None:
+                elapsed = 0.0
+            else:
+                # The other thread may have stamped a slightly later time
+                elapsed = max(now - self._last_update, 0.0)
+                now = max(now, self._last_update)
+            self._last_update = now
+
+            if (
+                self._score_variance > self.variance_threshold
+                or self._velocity > self.velocity_threshold
+            ):
+                # Ramp up immediately so a posture change is scored promptly
+                self.fps = self.max_fps
+            else:
+                decay = 0.5 ** (elapsed / self.half_life)
+                self.fps = max(self.min_fps, self.fps * decay)
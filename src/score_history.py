@@ -1,39 +1,257 @@
+from collections import deque
+from math import exp
 from time import time
 
 import numpy as np
 
 
-class ScoreHistory:
+class SlidingWindow:
+    """Mean and variance over the samples of the last ``size`` seconds.
+
+    Running sums are updated as samples arrive and expire, so each sample
+    costs O(1) amortized no matter how long the window is.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._samples = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def add(self, timestamp, score):
+        self._samples.append((timestamp, score))
+        self._sum += score
+        self._sum_sq += score * score
+
+    def evict(self, now):
+        samples = self._samples
+        while samples and now - samples[0][0] > self.size:
+            _, score = samples.popleft()
+            self._sum -= score
+            self._sum_sq -= score * score
+        if not samples:
+            # Drop accumulated rounding error whenever the window empties
+            self._sum = self._sum_sq = 0.0
+
+    @property
+    def count(self):
+        return len(self._samples)
+
+    @property
+    def mean(self):
+        return self._sum / len(self._samples) if self._samples else 0.0
+
+    @property
+    def variance(self):
+        count = len(self._samples)
+        if count < 2:
+            return 0.0
+        mean = self._sum / count
+        return max(self._sum_sq / count - mean * mean, 0.0)
+
+
+TREND_DTYPE = np.dtype(
+    [
+        ("bucket", np.float64),
+        ("count", np.int64),
+        ("mean", np.float64),
+        ("min", np.float64),
+        ("max", np.float64),
+    ]
+)
+
+
+class RollupRing:
+    """Fixed-size ring of score aggregates over ``resolution``-second buckets.
+
+    Only buckets that received samples take a slot, so ``capacity`` bounds
+    memory rather than wall-clock coverage.
+    """
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.buckets = np.zeros(capacity, dtype=np.float64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.sums = np.zeros(capacity, dtype=np.float64)
+        self.mins = np.zeros(capacity, dtype=np.float64)
+        self.maxs = np.zeros(capacity, dtype=np.float64)
+        self.head = -1  # slot of the open bucket
+        self.size = 0
+
+    def add(self, timestamp, count, total, low, high):
+        """Fold an aggregate in; returns the bucket it closed, if any"""
+        bucket = timestamp - timestamp % self.resolution
+        head = self.head
+        if head >= 0 and bucket <= self.buckets[head]:
+            # Same bucket, or a late sample folded into the open one
+            self.counts[head] += count
+            self.sums[head] += total
+            self.mins[head] = min(self.mins[head], low)
+            self.maxs[head] = max(self.maxs[head], high)
+            return None
+
+        closed = self.open_bucket()
+        head = self.head = (head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.buckets[head] = bucket
+        self.counts[head] = count
+        self.sums[head] = total
+        self.mins[head] = low
+        self.maxs[head] = high
+        return closed
+
+    def open_bucket(self):
+        """The bucket still receiving samples as a tuple, or None"""
+        head = self.head
+        if head < 0:
+            return None
+        return (
+            self.buckets[head],
+            self.counts[head],
+            self.sums[head],
+            self.mins[head],
+            self.maxs[head],
+        )
+
+    def query(self, since=None):
+        """Buckets in time order as a TREND_DTYPE array, open bucket included"""
+        order = np.arange(self.head - self.size + 1, self.head + 1) % self.capacity
+        trend = np.empty(self.size, dtype=TREND_DTYPE)
+        trend["bucket"] = self.buckets[order]
+        trend["count"] = self.counts[order]
+        trend["mean"] = self.sums[order] / np.maximum(self.counts[order], 1)
+        trend["min"] = self.mins[order]
+        trend["max"] = self.maxs[order]
+        if since is not None:
+            trend = trend[trend["bucket"] >= since - since % self.resolution]
+        return trend
+
+
+class ScoreTimeline:
+    """Cascading per-second, per-minute and per-hour score aggregates.
+
+    Samples land in the per-second ring; each second that closes is folded
+    into the per-minute ring, and each closed minute into the per-hour ring.
+    Queries fold in the still-open buckets of the finer levels, so every
+    level is up to date.
+    """
+
+    LEVELS = {
+        "second": (1, 3600),  # one hour of seconds
+        "minute": (60, 1440),  # one day of minutes
+        "hour": (3600, 24 * 31),  # a month of hours
+    }
+
     def __init__(self):
-        self.buffer_size = 1000
-        self.timestamps = np.zeros(self.buffer_size, dtype=np.float64)
-        self.scores = np.zeros(self.buffer_size, dtype=np.float32)
-        self.current_index = 0
-        self.is_buffer_full = False
-        self.WINDOW_SIZE = 5
+        self.rings = [
+            RollupRing(resolution, capacity)
+            for resolution, capacity in self.LEVELS.values()
+        ]
+        self._levels = dict(zip(self.LEVELS, self.rings))
+
+    def add(self, timestamp, score):
+        closed = self.rings[0].add(timestamp, 1, score, score, score)
+        for ring in self.rings[1:]:
+            if closed is None:
+                break
+            closed = ring.add(*closed)
+
+    def query(self, resolution="minute", since=None):
+        ring = self._levels[resolution]
+        trend = ring.query(since)
+        # Coarse to fine keeps the appended buckets in time order
+        for finer in reversed(self.rings[: self.rings.index(ring)]):
+            pending = finer.open_bucket()
+            if pending is None:
+                continue
+            timestamp, count, total, low, high = pending
+            bucket = timestamp - timestamp % ring.resolution
+            if since is not None and bucket < since - since % ring.resolution:
+                continue
+            if len(trend) and trend["bucket"][-1] == bucket:
+                last = trend[-1]
+                total += last["mean"] * last["count"]
+                count += last["count"]
+                low = min(low, last["min"])
+                high = max(high, last["max"])
+                trend = trend[:-1]
+            entry = np.array(
+                [(bucket, count, total / count, low, high)], dtype=TREND_DTYPE
+            )
+            trend = np.concatenate([trend, entry])
+        return trend
+
+
+class ScoreHistory:
+    def __init__(self, windows=(5, 60, 900), ewma_time_constant=5.0):
         self.SCORE_THRESHOLD = 65
 
-    def add_score(self, score):
-        current_time = time()
+        # Window sizes in seconds; the first is the default for averages
+        self.windows = {size: SlidingWindow(size) for size in windows}
+        self._default_window = windows[0]
 
-        self.timestamps[self.current_index] = current_time
-        self.scores[self.current_index] = score
+        # Time-aware EWMA: irregular sample spacing decays by elapsed time
+        self.ewma_time_constant = ewma_time_constant
+        self.ewma = None
+        self.ewm_variance = 0.0
+        self._last_timestamp = None
 
-        self.current_index = (self.current_index + 1) % self.buffer_size
-        if self.current_index == 0:
-            self.is_buffer_full = True
+        # Bounded long-term history for trends, independent of the windows
+        self.timeline = ScoreTimeline()
 
-    def get_average_score(self):
-        current_time = time()
-        if not self.is_buffer_full and self.current_index == 0:
-            return 0.0
+    @property
+    def WINDOW_SIZE(self):
+        return self._default_window
+
+    @WINDOW_SIZE.setter
+    def WINDOW_SIZE(self, size):
+        if size == self._default_window:
+            return
+        if size in self.windows:
+            # Resizing onto another window's key would silently replace it
+            raise ValueError(f"A {size} s window is already configured")
+        window = self.windows.pop(self._default_window)
+        window.size = size
+        self.windows[size] = window
+        self._default_window = size
 
-        valid_mask = current_time - self.timestamps <= self.WINDOW_SIZE
-        if self.is_buffer_full:
-            valid_scores = self.scores[valid_mask]
+    def add_score(self, score, timestamp=None):
+        current_time = time() if timestamp is None else timestamp
+        for window in self.windows.values():
+            window.add(current_time, score)
+            window.evict(current_time)
+        self._update_ewma(current_time, score)
+        self.timeline.add(current_time, score)
+
+    def _update_ewma(self, timestamp, score):
+        if self.ewma is None:
+            self.ewma = float(score)
         else:
-            valid_scores = self.scores[: self.current_index][
-                valid_mask[: self.current_index]
-            ]
+            elapsed = max(timestamp - self._last_timestamp, 0.0)
+            alpha = 1.0 - exp(-elapsed / self.ewma_time_constant)
+            delta = score - self.ewma
+            self.ewma += alpha * delta
+            self.ewm_variance = (1.0 - alpha) * (self.ewm_variance + alpha * delta**2)
+        self._last_timestamp = timestamp
+
+    def _window(self, size):
+        window = self.windows[self._default_window if size is None else size]
+        window.evict(time())
+        return window
+
+    def get_average_score(self, window=None):
+        return float(self._window(window).mean)
+
+    def get_score_variance(self, window=None):
+        return float(self._window(window).variance)
+
+    def get_sample_count(self, window=None):
+        return self._window(window).count
+
+    def get_ewma(self):
+        return 0.0 if self.ewma is None else self.ewma
 
-        return float(np.mean(valid_scores)) if len(valid_scores) > 0 else 0.0
+    def get_trend(self, resolution="minute", since=None):
+        """Per-second, -minute or -hour aggregates as a TREND_DTYPE array"""
+        return self.timeline.query(resolution, since)
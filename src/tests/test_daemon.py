@@ -0,0 +1,110 @@
+import json
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+from threading import Thread
+
+from ..daemon import JsonFormatter, PostureDaemon, ResultRecorder
+from ..frame_sources import ImageDirectorySource, SyntheticSource
+from ..rate_scheduler import AdaptiveRateScheduler
+
+
+class FakeDetector:
+    model_complexity, inference_width, inference_height = 1, 1280, 720
+
+    def __init__(self, score=72.0):
+        self.score = score
+        self.closed = False
+
+    def set_quality(self, model_complexity, width, height):
+        pass
+
+    def process_frame(self, frame, timestamp=None):
+        return frame, self.score, None
+
+    def close(self):
+        self.closed = True
+
+
+def test_runs_until_stopped():
+    detector = FakeDetector()
+    daemon = PostureDaemon(
+        SyntheticSource(width=8, height=4), detector=detector, notify=False
+    )
+    runner = Thread(target=daemon.run)
+    runner.start()
+    time.sleep(0.3)
+    daemon.stop()
+    runner.join(timeout=5)
+
+    assert not runner.is_alive()
+    assert detector.closed
+    assert daemon.scores.get_sample_count() > 0
+    assert daemon.scores.get_average_score() == 72.0
+
+
+def test_stops_when_source_ends(tmp_path):
+    import cv2
+    import numpy as np
+
+    cv2.imwrite(str(tmp_path / "a.png"), np.zeros((4, 4, 3), np.uint8))
+    daemon = PostureDaemon(
+        ImageDirectorySource(tmp_path), detector=FakeDetector(), notify=False
+    )
+    assert daemon.run()
+
+
+def test_unavailable_source(tmp_path):
+    daemon = PostureDaemon(
+        ImageDirectorySource(tmp_path), detector=FakeDetector(), notify=False
+    )
+    assert not daemon.run()
+
+
+def test_recorder_saves_on_interval_and_notifies():
+    class Recorded:
+        def __init__(self):
+            self.scores = []
+
+        def save_pose_data(self, landmarks, score):
+            self.scores.append(score)
+
+        def check_and_notify(self, score):
+            self.scores.append(score)
+
+    class Results:
+        pose_landmarks = object()
+
+    db, notifier = Recorded(), Recorded()
+    recorder = ResultRecorder(
+        AdaptiveRateScheduler(), db=db, notifier=notifier, db_save_interval=60
+    )
+    now = time.time()
+    for score in (60.0, 80.0, 100.0):
+        recorder.record(score, Results(), now)
+
+    assert db.scores == [60.0]
+    assert notifier.scores == [60.0, 70.0, 80.0]
+    assert recorder.scores.get_sample_count() == 3
+
+
+def test_json_log_lines():
+    record = logging.LogRecord(
+        "posture_tracker", logging.INFO, "", 0, "score", (), None
+    )
+    record.fields = {"score": 55.0, "dropped": 3}
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["event"] == "score"
+    assert entry["level"] == "info"
+    assert entry["score"] == 55.0 and entry["dropped"] == 3
+
+
+def test_does_not_import_qt():
+    src = Path(__file__).resolve().parents[1]
+    code = "import sys, daemon; print('PyQt6' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=src, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,270 @@
+import sqlite3
+from datetime import datetime
+from queue import Queue
+from time import sleep
+
+import numpy as np
+import pytest
+
+from ..db_manager import SCHEMA_VERSION, DBManager
+from ..pose_landmarks import POSTURE_LANDMARKS
+
+
+class MockLandmark:
+    def __init__(self, value):
+        self.x = self.y = self.z = self.visibility = value
+
+
+class MockLandmarks:
+    def __init__(self, value=0.5):
+        self.landmark = [MockLandmark(value) for _ in range(33)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "posture.db")
+
+
+def count_rows(db_path, table_name):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+
+
+def create_legacy_db(db_path, timestamps):
+    """An original-schema database with one snapshot per timestamp"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE posture_scores (timestamp DATETIME, score FLOAT)")
+        conn.execute(
+            "CREATE TABLE pose_landmarks (timestamp DATETIME, landmark_name TEXT, "
+            "x FLOAT, y FLOAT, z FLOAT, visibility FLOAT)"
+        )
+        for timestamp in timestamps:
+            conn.execute("INSERT INTO posture_scores VALUES (?, ?)", (timestamp, 72.5))
+            conn.executemany(
+                "INSERT INTO pose_landmarks VALUES (?, ?, ?, ?, ?, ?)",
+                [(timestamp, lm.name, 0.5, 0.5, 0.0, 1.0) for lm in POSTURE_LANDMARKS],
+            )
+    conn.close()
+
+
+class TestDBManager:
+    def test_wal_mode(self, db_path):
+        db = DBManager(db_path)
+        mode = db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        db.close()
+        assert mode == "wal"
+
+    def test_writes_are_batched_until_flush(self, db_path):
+        db = DBManager(db_path, batch_size=10000, flush_interval=60)
+        for _ in range(5):
+            db.save_pose_data(MockLandmarks(), 80.0)
+        assert count_rows(db_path, "posture_scores") == 0
+
+        assert db.flush(timeout=5)
+        assert count_rows(db_path, "posture_scores") == 5
+        assert count_rows(db_path, "pose_landmarks") == 5
+        db.close()
+
+    def test_flush_on_interval(self, db_path):
+        db = DBManager(db_path, batch_size=10000, flush_interval=0.05)
+        db.save_pose_data(MockLandmarks(), 80.0)
+        sleep(0.5)
+        assert count_rows(db_path, "posture_scores") == 1
+        db.close()
+
+    def test_close_flushes_pending_rows(self, db_path):
+        db = DBManager(db_path, batch_size=10000, flush_interval=60)
+        db.save_pose_data(MockLandmarks(), 80.0)
+        db.close()
+        assert count_rows(db_path, "posture_scores") == 1
+        assert not db._writer.is_alive()
+
+    def test_flush_after_close_returns(self, db_path):
+        db = DBManager(db_path)
+        db.close()
+        assert db.flush()
+
+    def test_in_memory_database_rejected(self):
+        with pytest.raises(ValueError):
+            DBManager(":memory:")
+
+    def test_full_queue_drops_rows(self, db_path):
+        db = DBManager(db_path)
+        # Swap in a full queue the writer is not draining
+        writer_queue, db._queue = db._queue, Queue(maxsize=1)
+        db.insert_async("posture_scores", [("t", 1.0)])
+        db.insert_async("posture_scores", [("t", 2.0), ("t", 3.0)])
+        assert db.dropped_rows == 2
+        db._queue = writer_queue
+        db.close()
+
+    def test_one_packed_row_per_snapshot(self, db_path):
+        db = DBManager(db_path)
+        db.save_pose_data(MockLandmarks(0.25), 80.0)
+        db.flush(timeout=5)
+
+        assert count_rows(db_path, "pose_landmarks") == 1
+        timestamps, landmarks = db.read_landmarks()
+        assert timestamps.dtype == np.int64
+        assert landmarks.shape == (1, len(POSTURE_LANDMARKS), 4)
+        assert np.all(landmarks == 0.25)
+
+        timestamps, scores = db.read_scores(start_ms=int(timestamps[0]))
+        assert scores.tolist() == [80.0]
+        assert db.read_scores(end_ms=int(timestamps[0]) - 1)[1].size == 0
+        db.close()
+
+    def test_read_full_skeleton(self, db_path):
+        db = DBManager(db_path)
+        db.save_pose_data(MockLandmarks(0.5), 80.0)
+        db.flush(timeout=5)
+        _, landmarks = db.read_landmarks(full_skeleton=True)
+        db.close()
+
+        assert landmarks.shape == (1, 33, 4)
+        assert landmarks[0, int(POSTURE_LANDMARKS[-1]), 0] == 0.5
+        # Landmarks that are not stored come back as NaN
+        assert np.isnan(landmarks[0, 32]).all()
+
+    def test_migrates_legacy_schema(self, db_path):
+        timestamp = "2024-05-01T09:30:00.250000"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE posture_scores (timestamp DATETIME, score FLOAT)"
+            )
+            conn.execute(
+                "CREATE TABLE pose_landmarks (timestamp DATETIME, landmark_name TEXT, "
+                "x FLOAT, y FLOAT, z FLOAT, visibility FLOAT)"
+            )
+            conn.execute("INSERT INTO posture_scores VALUES (?, ?)", (timestamp, 72.5))
+            conn.executemany(
+                "INSERT INTO pose_landmarks VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (timestamp, lm.name, i, 0.5, 0.0, 1.0)
+                    for i, lm in enumerate(POSTURE_LANDMARKS)
+                ],
+            )
+        conn.close()
+
+        db = DBManager(db_path)
+        expected_ms = int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+        timestamps, scores = db.read_scores()
+        assert timestamps.tolist() == [expected_ms]
+        assert scores.tolist() == [72.5]
+
+        timestamps, landmarks = db.read_landmarks()
+        assert timestamps.tolist() == [expected_ms]
+        assert landmarks[0, :, 0].tolist() == list(range(len(POSTURE_LANDMARKS)))
+        version = db.conn.execute("PRAGMA user_version").fetchone()[0]
+        db.close()
+        assert version == SCHEMA_VERSION
+
+    def test_failed_migration_keeps_legacy_tables(self, db_path, monkeypatch):
+        create_legacy_db(db_path, ["2024-05-01T09:30:00"])
+
+        def crash(timestamp):
+            raise RuntimeError("killed mid-migration")
+
+        monkeypatch.setattr(DBManager, "_iso_to_epoch_ms", staticmethod(crash))
+        with pytest.raises(RuntimeError):
+            DBManager(db_path)
+        with sqlite3.connect(db_path) as conn:
+            tables = {
+                row[0]
+                for row in conn.execute("SELECT name FROM sqlite_master")
+                if not row[0].startswith("sqlite_")
+            }
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+        assert tables == {"posture_scores", "pose_landmarks"}
+        assert version == 0
+
+        # Once the problem is gone the migration runs normally
+        monkeypatch.undo()
+        db = DBManager(db_path)
+        assert db.read_scores()[1].tolist() == [72.5]
+        db.close()
+
+    def test_migration_skips_unreadable_timestamps(self, db_path):
+        create_legacy_db(db_path, ["2024-05-01T09:30:00", "yesterday"])
+        db = DBManager(db_path)
+        timestamps, _ = db.read_scores()
+        landmark_timestamps, _ = db.read_landmarks()
+        db.close()
+        assert len(timestamps) == 1
+        assert len(landmark_timestamps) == 1
+
+    def test_timestamp_indexes(self, db_path):
+        db = DBManager(db_path)
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM posture_scores WHERE timestamp > 0"
+        ).fetchall()
+        db.close()
+        assert "idx_posture_scores_timestamp" in str(plan)
+
+    def test_rollups_updated_incrementally(self, db_path):
+        db = DBManager(db_path, poor_posture_threshold=60, max_sample_gap=120)
+        start = int(datetime(2024, 5, 1, 9, 0).timestamp() * 1000)
+        # One score every 30 s for two minutes, then one after a long gap
+        db.insert("posture_scores", [(start, 80.0), (start + 30000, 50.0)])
+        db.insert("posture_scores", [(start + 60000, 40.0), (start + 90000, 90.0)])
+        db.insert("posture_scores", [(start + 3600000, 30.0)])
+
+        resolution, minutes = db.get_score_rollup(start, start + 3600000, "minute")
+        assert resolution == "minute"
+        assert minutes["bucket"].tolist() == [start, start + 60000, start + 3600000]
+        assert minutes["count"].tolist() == [2, 2, 1]
+        assert minutes["mean"].tolist() == [65.0, 65.0, 30.0]
+        assert minutes["min"].tolist() == [50.0, 40.0, 30.0]
+        # Low scores count the time since the previous sample, capped
+        assert minutes["below_ms"].tolist() == [30000, 30000, 120000]
+
+        _, hours = db.get_score_rollup(start, start + 3600000, "hour")
+        assert hours["count"].tolist() == [4, 1]
+        _, days = db.get_score_rollup(resolution="day")
+        assert days["count"].tolist() == [5]
+        assert days["max"].tolist() == [90.0]
+        db.close()
+
+    def test_rolled_back_batch_leaves_rollup_timing(self, db_path):
+        db = DBManager(db_path, batch_size=10000, flush_interval=60)
+        start = int(datetime(2024, 5, 1, 9, 0).timestamp() * 1000)
+        db.insert_async("posture_scores", [(start, 80.0)])
+        assert db.flush(timeout=5)
+        # The second table fails, so the whole batch rolls back
+        db.insert_async("posture_scores", [(start + 60000, 50.0)])
+        db.insert_async("no_such_table", [(1,)])
+        assert db.flush(timeout=5)
+        db.insert_async("posture_scores", [(start + 90000, 40.0)])
+        assert db.flush(timeout=5)
+
+        _, minutes = db.get_score_rollup(start, start + 60000, "minute")
+        assert minutes["count"].tolist() == [1, 1]
+        # Measured from the last committed score, not the rolled-back one
+        assert minutes["below_ms"].tolist() == [0, 90000]
+        db.close()
+
+    def test_score_summary(self, db_path):
+        db = DBManager(db_path)
+        start = int(datetime(2024, 5, 1).timestamp() * 1000)
+        db.insert("posture_scores", [(start + i * 60000, 70.0 + i) for i in range(5)])
+        summary = db.get_score_summary(start, start + 3600000)
+        assert summary["count"] == 5
+        assert summary["mean"] == 72.0
+        assert (summary["min"], summary["max"]) == (70.0, 74.0)
+        assert db.get_score_summary(0, 1)["count"] == 0
+        db.close()
+
+    def test_rollups_rebuilt_on_upgrade(self, db_path):
+        db = DBManager(db_path)
+        start = int(datetime(2024, 5, 1).timestamp() * 1000)
+        db.insert("posture_scores", [(start, 70.0), (start + 1000, 80.0)])
+        db.conn.execute("DELETE FROM score_rollup_day")
+        db.conn.execute("PRAGMA user_version = 1")
+        db.conn.commit()
+        db.close()
+
+        db = DBManager(db_path)
+        _, days = db.get_score_rollup(resolution="day")
+        db.close()
+        assert days["count"].tolist() == [2]
@@ -0,0 +1,134 @@
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from .. import frame_sources
+
+
+class RecordingCapture:
+    """Stands in for cv2.VideoCapture, accepting whatever is set"""
+
+    def __init__(self, *args):
+        self.args = args
+        self.props = {}
+        self.set_order = []
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        self.set_order.append(prop)
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+    def read(self):
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+class TestCameraSource:
+    def test_negotiates_format_size_and_buffering(self):
+        with patch("cv2.VideoCapture", RecordingCapture):
+            source = frame_sources.CameraSource(width=640, height=360, fps=15)
+            assert source.open()
+            cap = source.cap
+
+        assert cap.props[cv2.CAP_PROP_BUFFERSIZE] == 1
+        assert cap.set_order.index(cv2.CAP_PROP_FOURCC) < cap.set_order.index(
+            cv2.CAP_PROP_FRAME_WIDTH
+        )
+        assert source.negotiated == {
+            "fourcc": "MJPG",
+            "width": 640,
+            "height": 360,
+            "fps": 15,
+        }
+        source.release()
+        assert source.cap is None
+
+    def test_unavailable_camera(self):
+        class ClosedCapture(RecordingCapture):
+            def isOpened(self):
+                return False
+
+        with patch("cv2.VideoCapture", ClosedCapture):
+            source = frame_sources.CameraSource()
+            assert not source.open()
+            assert source.cap is None
+
+
+def test_video_file_source(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(3):
+        writer.write(np.full((48, 64, 3), i * 80, dtype=np.uint8))
+    writer.release()
+
+    source = frame_sources.VideoFileSource(path)
+    assert source.open()
+    frames = [source.read() for _ in range(4)]
+    assert [ok for ok, _ in frames] == [True, True, True, False]
+    assert frames[0][1].shape == (48, 64, 3)
+    source.release()
+
+    looping = frame_sources.VideoFileSource(path, loop=True)
+    assert looping.open()
+    assert all(looping.read()[0] for _ in range(7))
+    looping.release()
+
+
+def test_image_directory_source_reads_in_name_order(tmp_path):
+    for name, value in (("b.png", 20), ("a.png", 10), ("c.png", 30)):
+        cv2.imwrite(str(tmp_path / name), np.full((8, 8, 3), value, np.uint8))
+    (tmp_path / "notes.txt").write_text("not an image")
+
+    source = frame_sources.ImageDirectorySource(tmp_path)
+    assert source.open()
+    values = [int(source.read()[1][0, 0, 0]) for _ in range(3)]
+    assert values == [10, 20, 30]
+    assert source.read() == (False, None)
+
+
+def test_image_directory_source_empty(tmp_path):
+    assert not frame_sources.ImageDirectorySource(tmp_path).open()
+
+
+def test_synthetic_source():
+    source = frame_sources.SyntheticSource(width=32, height=16, pool_size=2)
+    assert source.open()
+    first, second, third = (source.read()[1] for _ in range(3))
+    assert first.shape == (16, 32, 3)
+    assert not np.array_equal(first, second)
+    assert np.array_equal(third, first)
+    # Drawing on a frame must not change later reads
+    first[:] = 0
+    assert np.array_equal(source.read()[1], second)
+    assert not np.array_equal(source.read()[1], first)
+
+
+def test_frame_source_requires_read():
+    class NoRead(frame_sources.FrameSource):
+        pass
+
+    with pytest.raises(TypeError):
+        NoRead()
+
+
+def test_create_source(tmp_path):
+    assert isinstance(frame_sources.create_source("1"), frame_sources.CameraSource)
+    assert frame_sources.create_source("1").camera_id == 1
+    synthetic = frame_sources.create_source("synthetic:320x240")
+    assert (synthetic.width, synthetic.height) == (320, 240)
+    assert isinstance(
+        frame_sources.create_source(str(tmp_path)), frame_sources.ImageDirectorySource
+    )
+    assert isinstance(
+        frame_sources.create_source("clip.mp4"), frame_sources.VideoFileSource
+    )
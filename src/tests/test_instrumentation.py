@@ -0,0 +1,108 @@
+import json
+import sys
+from threading import Thread
+
+import pytest
+
+from ..instrumentation import Histogram, Metrics, StatsExporter
+
+
+@pytest.fixture
+def registry():
+    registry = Metrics()
+    registry.enable()
+    return registry
+
+
+class TestHistogram:
+    def test_observe_buckets(self):
+        histogram = Histogram(bounds=(10, 100, 1000))
+        for value in (5, 10, 50, 500, 5000):
+            histogram.observe(value)
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.count == 5
+        assert histogram.total == 5565
+
+    def test_percentile_is_bucket_upper_bound(self):
+        histogram = Histogram(bounds=(10, 100, 1000))
+        for _ in range(90):
+            histogram.observe(5)
+        for _ in range(10):
+            histogram.observe(500)
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(95) == 1000
+
+    def test_empty(self):
+        assert Histogram().snapshot()["p99_ms"] == 0
+
+
+class TestMetrics:
+    def test_disabled_by_default(self):
+        assert not Metrics().enabled
+
+    def test_snapshot(self, registry):
+        registry.observe("detector.inference", 2_000_000)
+        registry.increment("db.rows_written", 3)
+        registry.increment("db.rows_written")
+        snapshot = registry.snapshot()
+        assert snapshot["histograms"]["detector.inference"]["count"] == 1
+        assert snapshot["histograms"]["detector.inference"]["mean_ms"] == 2.0
+        assert snapshot["counters"] == {"db.rows_written": 4}
+
+    def test_enable_resets(self, registry):
+        registry.increment("webcam.frames_dropped")
+        registry.disable()
+        registry.enable()
+        assert registry.counters == {}
+
+    def test_concurrent_updates_are_not_lost(self, registry):
+        # Switch threads as often as possible to provoke lost updates
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        def feed():
+            for _ in range(20000):
+                registry.observe("pool.inference", 50_000)
+                registry.increment("pool.frames")
+
+        threads = [Thread(target=feed) for _ in range(4)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        histogram = registry.histograms["pool.inference"]
+        assert histogram.count == sum(histogram.counts) == 80000
+        assert histogram.total == 80000 * 50_000
+        assert registry.counters["pool.frames"] == 80000
+
+    def test_prometheus_format(self, registry):
+        registry.observe("db.write_batch", 15_000)
+        registry.increment("notifications.sent")
+        text = registry.to_prometheus()
+        assert "# TYPE posture_tracker_db_write_batch_seconds histogram" in text
+        assert 'posture_tracker_db_write_batch_seconds_bucket{le="1e-05"} 0' in text
+        assert 'posture_tracker_db_write_batch_seconds_bucket{le="2e-05"} 1' in text
+        assert 'posture_tracker_db_write_batch_seconds_bucket{le="+Inf"} 1' in text
+        assert "posture_tracker_db_write_batch_seconds_count 1" in text
+        assert "posture_tracker_notifications_sent_total 1" in text
+
+
+class TestStatsExporter:
+    def test_writes_json(self, registry, tmp_path):
+        registry.increment("webcam.frames_dropped", 2)
+        path = tmp_path / "stats.json"
+        StatsExporter(str(path), registry=registry).write()
+        data = json.loads(path.read_text())
+        assert data["counters"] == {"webcam.frames_dropped": 2}
+
+    def test_writes_prometheus(self, registry, tmp_path):
+        registry.increment("webcam.frames_dropped")
+        path = tmp_path / "stats.prom"
+        exporter = StatsExporter(str(path), interval=0.01, registry=registry)
+        exporter.start()
+        exporter.stop()
+        assert "webcam_frames_dropped_total 1" in path.read_text()
+        assert not (tmp_path / "stats.prom.tmp").exists()
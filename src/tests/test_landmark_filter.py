@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from ..landmark_filter import OneEuroFilter
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def run(landmark_filter, samples, timestamps):
+    return np.array([landmark_filter(s, t) for s, t in zip(samples, timestamps)])
+
+
+class TestOneEuroFilter:
+    def test_first_sample_passes_through(self):
+        points = np.full((33, 3), 0.4)
+        assert np.array_equal(OneEuroFilter()(points, 0.0), points)
+
+    def test_constant_input_unchanged(self):
+        points = np.full((33, 3), 0.4)
+        output = run(OneEuroFilter(), [points] * 10, np.arange(10) / 30)
+        assert np.allclose(output, 0.4)
+
+    def test_reduces_jitter_on_still_pose(self, rng):
+        truth = np.full((33, 3), 0.5)
+        samples = truth + rng.normal(0, 0.005, (300, 33, 3))
+        output = run(OneEuroFilter(), samples, np.arange(300) / 30)
+        raw_error = np.abs(samples[100:] - truth).mean()
+        smoothed_error = np.abs(output[100:] - truth).mean()
+        assert smoothed_error < raw_error / 2
+
+    def test_reduces_jitter_at_one_hertz(self, rng):
+        # A still pose sampled at the rate scheduler's floor
+        truth = np.full((33, 3), 0.5)
+        samples = truth + rng.normal(0, 0.005, (60, 33, 3))
+        output = run(OneEuroFilter(), samples, np.arange(60) * 1.0)
+        raw_error = np.abs(samples[10:] - truth).mean()
+        smoothed_error = np.abs(output[10:] - truth).mean()
+        assert smoothed_error < raw_error * 0.7
+
+    def test_follows_fast_movement(self):
+        samples = np.concatenate([np.zeros((30, 33, 3)), np.full((30, 33, 3), 0.3)])
+        output = run(OneEuroFilter(), samples, np.arange(60) / 30)
+        # Within a third of a second of the jump the filter has caught up
+        assert np.allclose(output[-20:], 0.3, atol=0.01)
+
+    def test_irregular_spacing_uses_elapsed_time(self):
+        points = np.zeros((33, 3))
+        moved = np.full((33, 3), 0.1)
+        short_gap = OneEuroFilter()
+        short_gap(points, 0.0)
+        long_gap = OneEuroFilter()
+        long_gap(points, 0.0)
+        # The same jump moves the output further after more time has passed
+        assert long_gap(moved, 1.0)[0, 0] > short_gap(moved, 0.01)[0, 0]
+
+    def test_restarts_after_long_gap(self):
+        landmark_filter = OneEuroFilter(max_gap=2.0)
+        landmark_filter(np.zeros((33, 3)), 0.0)
+        moved = np.full((33, 3), 0.3)
+        assert np.array_equal(landmark_filter(moved, 5.0), moved)
+
+    def test_repeated_timestamp_returns_previous_output(self):
+        landmark_filter = OneEuroFilter()
+        first = landmark_filter(np.zeros((33, 3)), 1.0)
+        assert np.array_equal(landmark_filter(np.ones((33, 3)), 1.0), first)
+
+    def test_reset(self):
+        landmark_filter = OneEuroFilter()
+        landmark_filter(np.zeros((33, 3)), 0.0)
+        landmark_filter.reset()
+        moved = np.full((33, 3), 0.3)
+        assert np.array_equal(landmark_filter(moved, 0.01), moved)
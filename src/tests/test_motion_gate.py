@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from ..motion_gate import MotionGate
+
+
+@pytest.fixture
+def gate():
+    return MotionGate(threshold=2.0, max_skipped=3)
+
+
+@pytest.fixture
+def still_frame():
+    return np.full((480, 640, 3), 100, dtype=np.uint8)
+
+
+class TestMotionGate:
+    def test_first_frame_always_processed(self, gate, still_frame):
+        assert gate.should_process(still_frame)
+        assert gate.get_stats() == {"skipped": 0, "analyzed": 1}
+
+    def test_unchanged_frames_skipped_up_to_limit(self, gate, still_frame):
+        decisions = [gate.should_process(still_frame) for _ in range(6)]
+        assert decisions == [True, False, False, False, True, False]
+        assert gate.get_stats() == {"skipped": 4, "analyzed": 2}
+
+    def test_motion_triggers_inference(self, gate, still_frame):
+        gate.should_process(still_frame)
+        moved = still_frame.copy()
+        moved[:, :320] = 200
+        assert gate.should_process(moved)
+
+    def test_small_noise_ignored(self, gate, still_frame):
+        gate.should_process(still_frame)
+        noisy = still_frame + np.uint8(1)
+        assert not gate.should_process(noisy)
+
+    def test_reset(self, gate, still_frame):
+        gate.should_process(still_frame)
+        gate.reset()
+        assert gate.should_process(still_frame)
+        assert gate.get_stats() == {"skipped": 0, "analyzed": 1}
@@ -0,0 +1,118 @@
+import time
+from threading import Lock
+
+import numpy as np
+import pytest
+
+from ..frame_sources import FrameSource
+from ..pipeline_manager import InferencePool, PipelineManager
+
+
+class ConstantSource(FrameSource):
+    """Endless frames filled with one value, so results show their camera"""
+
+    def __init__(self, value, frames=None):
+        self.value = value
+        self.frames = frames
+
+    def read(self):
+        if self.frames is not None:
+            if self.frames == 0:
+                return False, None
+            self.frames -= 1
+        return True, np.full((4, 4, 3), self.value, dtype=np.uint8)
+
+
+class SlowDetector:
+    """Scores a frame by its pixel value and tracks how many run at once"""
+
+    active = 0
+    peak = 0
+    lock = Lock()
+
+    def __init__(self):
+        self.closed = False
+
+    def process_frame(self, frame, timestamp=None):
+        with SlowDetector.lock:
+            SlowDetector.active += 1
+            SlowDetector.peak = max(SlowDetector.peak, SlowDetector.active)
+        time.sleep(0.01)
+        with SlowDetector.lock:
+            SlowDetector.active -= 1
+        return frame, float(frame[0, 0, 0]), None
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    SlowDetector.active = SlowDetector.peak = 0
+
+
+def run_for(manager, seconds):
+    for pipeline in manager.pipelines.values():
+        assert pipeline.start()
+    time.sleep(seconds)
+    manager.stop()
+    manager.shutdown()
+
+
+def test_pool_bounds_concurrency_and_closes_detectors():
+    pool = InferencePool(SlowDetector, workers=2)
+    manager = PipelineManager(pool)
+    for value in (10, 20, 30, 40):
+        manager.add_pipeline(f"cam{value}", ConstantSource(value))
+    run_for(manager, 0.3)
+
+    assert 1 <= SlowDetector.peak <= 2
+    assert all(detector.closed for detector in pool.detectors)
+
+
+def test_pipelines_keep_separate_histories():
+    manager = PipelineManager(InferencePool(SlowDetector, workers=1))
+    manager.add_pipeline("left", ConstantSource(30))
+    manager.add_pipeline("right", ConstantSource(70))
+    run_for(manager, 0.3)
+
+    assert manager.pipelines["left"].scores.get_ewma() == 30.0
+    assert manager.pipelines["right"].scores.get_ewma() == 70.0
+
+
+def test_pipelines_share_a_worker_fairly():
+    manager = PipelineManager(InferencePool(SlowDetector, workers=1))
+    for value in (1, 2, 3):
+        manager.add_pipeline(f"cam{value}", ConstantSource(value))
+    run_for(manager, 0.5)
+
+    processed = [
+        p.frame_reader.get_stats()["processed"] for p in manager.pipelines.values()
+    ]
+    assert min(processed) > 0
+    assert max(processed) - min(processed) <= 2
+
+
+def test_duplicate_pipeline_name():
+    manager = PipelineManager(InferencePool(SlowDetector, workers=1))
+    manager.add_pipeline("cam", ConstantSource(1))
+    with pytest.raises(ValueError):
+        manager.add_pipeline("cam", ConstantSource(2))
+    manager.pool.close()
+
+
+def test_run_returns_when_sources_end():
+    manager = PipelineManager(InferencePool(SlowDetector, workers=1))
+    manager.add_pipeline("clip", ConstantSource(5, frames=3))
+    assert manager.run()
+
+
+def test_detector_errors_reach_the_caller():
+    class BrokenDetector(SlowDetector):
+        def process_frame(self, frame, timestamp=None):
+            raise RuntimeError("boom")
+
+    pool = InferencePool(BrokenDetector, workers=1)
+    with pytest.raises(RuntimeError):
+        pool.process_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+    pool.close()
@@ -1,8 +1,16 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+from threading import Thread
+
 import cv2
 import numpy as np
 import pytest
 
+from ..landmark_filter import OneEuroFilter
 from ..pose_detector import PoseDetector
+from ..pose_landmarks import PoseLandmark
 
 
 @pytest.fixture
@@ -108,3 +116,183 @@ class TestPoseDetector:
         essential_landmarks = {"NOSE", "LEFT_SHOULDER", "RIGHT_SHOULDER"}
         landmark_names = {lm.name for lm in pd.posture_landmarks}
         assert essential_landmarks.issubset(landmark_names)
+
+    def test_landmark_indices_match_mediapipe(self):
+        import mediapipe as mp
+
+        assert {lm.name: int(lm) for lm in PoseLandmark} == {
+            lm.name: int(lm) for lm in mp.solutions.pose.PoseLandmark
+        }
+
+    def test_background_model_load(self, mock_frame):
+        detector = PoseDetector(load_model=False)
+        assert detector.pose is None
+        detector.load_model_async()
+        # analyze_frame waits for the loader rather than failing
+        score, results = detector.analyze_frame(mock_frame)
+        assert detector.pose is not None
+        assert score == 0.0 and results is None
+        detector.close()
+
+    def test_concurrent_loads_build_one_model(self, monkeypatch):
+        detector = PoseDetector(load_model=False)
+        built = []
+
+        def slow_create():
+            built.append(object())
+            time.sleep(0.05)
+            return built[-1]
+
+        monkeypatch.setattr(detector, "_create_model", slow_create)
+        # The frame path loads synchronously while the background load starts
+        threads = [Thread(target=detector.load_model) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        detector.load_model_async(warm_up=False)
+        for thread in threads:
+            thread.join()
+        detector.wait_for_model()
+        assert len(built) == 1
+        assert detector.pose is built[0]
+
+    def test_suspend_and_resume(self, mock_frame):
+        detector = PoseDetector(inference_width=320, inference_height=180)
+        detector.suspend()
+        assert detector.pose is None
+        assert detector.clahe is None and detector._rgb is None
+
+        detector.resume()
+        assert detector.wait_for_model()
+        assert detector._rgb.shape == (180, 320, 3)
+        detector.close()
+
+    def test_analyze_after_suspend(self, mock_frame):
+        detector = PoseDetector()
+        detector.suspend()
+        score, results = detector.analyze_frame(mock_frame)
+        assert score == 0.0 and results is None
+        assert detector.pose is not None
+        detector.close()
+
+    def test_landmark_filter_smooths_in_place(self, mock_landmarks):
+        detector = PoseDetector(landmark_filter=OneEuroFilter(), load_model=False)
+        detector._smooth_landmarks(mock_landmarks(), 0.0)
+        jumped = mock_landmarks({0: (0.9, 0.5, 0)})
+        detector._smooth_landmarks(jumped, 0.01)
+        # A jump 10 ms later is only partly followed
+        assert 0.5 < jumped.landmark[0].x < 0.9
+        assert jumped.landmark[1].x == pytest.approx(0.5)
+
+    def test_landmark_filter_uses_capture_time(self, mock_frame, mock_landmarks):
+        stamps = []
+
+        def recording_filter(points, timestamp):
+            stamps.append(timestamp)
+            return points
+
+        class FakePose:
+            def process(self, rgb_frame):
+                class Results:
+                    pose_landmarks = mock_landmarks()
+
+                return Results()
+
+        detector = PoseDetector(landmark_filter=recording_filter, load_model=False)
+        detector.pose = FakePose()
+        detector.analyze_frame(mock_frame, 12.5)
+        assert stamps == [12.5]
+
+    def test_set_quality_resizes_buffers(self, mock_frame):
+        detector = PoseDetector()
+        detector.set_quality(1, 640, 360)
+        assert detector.preprocess(mock_frame).shape == (360, 640, 3)
+        detector.close()
+
+    def test_failed_model_switch_keeps_previous_model(self, monkeypatch):
+        detector = PoseDetector()
+        load_model = detector.load_model
+
+        def failing_load():
+            if detector.model_complexity == 2:
+                raise RuntimeError("download failed")
+            load_model()
+
+        monkeypatch.setattr(detector, "load_model", failing_load)
+        with pytest.raises(RuntimeError):
+            detector.set_quality(2, 640, 360)
+        assert detector.model_complexity == 1 and detector.pose is not None
+        assert detector.inference_width == 1280
+        detector.close()
+
+    def test_import_does_not_load_mediapipe(self):
+        src = Path(__file__).resolve().parents[1]
+        code = (
+            "import sys, pose_detector; pose_detector.PoseDetector(load_model=False); "
+            "print('mediapipe' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=src, capture_output=True, text=True
+        ).stdout
+        assert output.strip() == "False"
+
+    def test_inference_resolution_independent_of_display(self, mock_frame):
+        detector = PoseDetector(inference_width=640, inference_height=360)
+        rgb_frame = detector.preprocess(detector.resize_for_display(mock_frame))
+        assert rgb_frame.shape == (360, 640, 3)
+        # Buffers are reused between frames rather than reallocated
+        assert detector.preprocess(mock_frame) is rgb_frame
+
+        processed_frame, _, _ = detector.process_frame(mock_frame)
+        assert processed_frame.shape == (720, 1280, 3)
+
+    def test_roi_tracking_bounds_and_fallback(self, mock_landmarks):
+        detector = PoseDetector(roi_tracking=True)
+        landmarks = mock_landmarks({0: (0.4, 0.2, 0), 23: (0.6, 0.8, 0)})
+        for lm in landmarks.landmark:
+            lm.visibility = 1.0
+
+        detector._update_roi(landmarks)
+        x0, y0, x1, y1 = detector.roi
+        assert x0 <= 0.4 and x1 >= 0.6 and y0 <= 0.2 and y1 >= 0.8
+
+        # Low confidence drops back to full-frame detection
+        for lm in landmarks.landmark:
+            lm.visibility = 0.1
+        detector._update_roi(landmarks)
+        assert detector.roi is None
+
+        detector._update_roi(None)
+        assert detector.roi is None
+
+    def test_roi_landmarks_mapped_to_frame(self, mock_landmarks):
+        landmarks = mock_landmarks({0: (0.0, 1.0, 0.5)})
+        PoseDetector._roi_to_frame_coords(landmarks, (0.25, 0.5, 0.75, 1.0))
+        nose = landmarks.landmark[0]
+        assert (nose.x, nose.y, nose.z) == (0.25, 1.0, 0.25)
+        assert landmarks.landmark[1].x == 0.5
+
+    def test_roi_crop_processing(self, mock_frame):
+        detector = PoseDetector(roi_tracking=True)
+        buffers = detector._buffers
+        detector.roi = (0.25, 0.0, 0.75, 1.0)
+        processed_frame, score, _ = detector.process_frame(mock_frame)
+        assert processed_frame.shape == (720, 1280, 3)
+        assert detector._rgb.shape == (720, 640, 3)
+        # Nothing detected, so the next frame falls back to full frame
+        assert detector.roi is None
+
+        # Crops and full frames share the buffers allocated at inference size
+        detector.process_frame(mock_frame)
+        assert detector._rgb.shape == (720, 1280, 3)
+        assert detector._buffers is buffers
+        assert np.shares_memory(detector._rgb, buffers[3])
+
+    def test_analysis_without_overlay(self, pd, mock_frame):
+        pd.render_overlay = False
+        original = mock_frame.copy()
+        processed_frame, score, landmarks = pd.process_frame(mock_frame)
+        # The frame is neither resized nor drawn on
+        assert processed_frame is mock_frame
+        assert np.array_equal(processed_frame, original)
+        assert score == 0.0
+        assert landmarks is None
@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+import pytest
+
+from ..pose_worker import ProcessPoseDetector
+
+
+@pytest.fixture
+def worker():
+    detector = ProcessPoseDetector()
+    yield detector
+    detector.close()
+
+
+def test_empty_frame_round_trip(worker):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    processed_frame, score, results = worker.process_frame(frame)
+    assert processed_frame.shape == (720, 1280, 3)
+    assert score == 0.0
+    assert results is None
+    assert worker.is_alive()
+
+
+def test_crashed_worker_is_restarted(worker):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    worker.process_frame(frame)
+    worker._process.kill()
+    worker._process.join()
+
+    _, score, _ = worker.process_frame(frame)
+    assert worker.restarts == 1
+    assert worker.is_alive()
+    assert score == 0.0
+
+
+def test_landmarks_rebuilt_as_landmark_list():
+    landmarks = np.tile(np.array([0.25, 0.5, -0.1, 0.9], dtype=np.float32), (33, 1))
+    landmark_list = ProcessPoseDetector._to_landmark_list(landmarks)
+    assert len(landmark_list.landmark) == 33
+    assert landmark_list.landmark[0].x == pytest.approx(0.25)
+    assert landmark_list.landmark[32].visibility == pytest.approx(0.9)
+
+
+def test_failed_model_load_raises_and_keeps_previous_settings(worker):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    worker.process_frame(frame)
+
+    # The child cannot build a PoseDetector with this complexity
+    with pytest.raises(RuntimeError, match="failed to start"):
+        worker.set_quality("unloadable", 640, 360)
+    assert worker.model_complexity == 1
+    assert worker.inference_width == 1280
+
+    _, score, _ = worker.process_frame(frame)
+    assert worker.restarts == 0
+    assert worker.is_alive()
+
+
+def test_failed_start_is_retried_with_backoff():
+    worker = ProcessPoseDetector(
+        model_complexity="unloadable", retry_delay=60, max_retry_delay=300
+    )
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    with pytest.raises(RuntimeError, match="failed to start"):
+        worker.process_frame(frame)
+
+    # Within the backoff, frames fail at once instead of respawning the worker
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="retrying in"):
+        worker.process_frame(frame)
+    assert time.monotonic() - start < 1.0
+    assert worker._process is None
+    assert worker.restarts == 0
+
+    worker._retry_at = 0.0
+    with pytest.raises(RuntimeError, match="failed to start"):
+        worker.process_frame(frame)
+    assert worker.restarts == 1
+    # The delay doubles after each failure
+    assert worker._retry_at - time.monotonic() > 100
+    worker.close()
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from ..pose_detector import PoseDetector
+from ..posture_score import COMPONENT_NAMES, angles_between, score_poses
+
+
+def make_pose(overrides):
+    pose = np.tile(np.array([0.5, 0.5, 0.0, 1.0], dtype=np.float32), (33, 1))
+    for idx, (x, y, z) in overrides.items():
+        pose[idx, :3] = (x, y, z)
+    return pose
+
+
+@pytest.fixture
+def poses():
+    good = make_pose({0: (0.5, 0.3, 0), 12: (0.5, 0.5, 0)})
+    poor = make_pose(
+        {
+            0: (0.7, 0.3, 0.3),
+            11: (0.45, 0.5, 0.1),
+            12: (0.5, 0.5, 0),
+            23: (0.5, 0.7, 0.1),
+        }
+    )
+    return np.stack([good, poor])
+
+
+class TestScorePoses:
+    def test_batch_shapes_and_ranges(self, poses):
+        scores, components = score_poses(poses)
+        assert scores.shape == (2,)
+        assert components.shape == (2, len(COMPONENT_NAMES))
+        assert np.all((components >= 0) & (components <= 1))
+        assert 90 <= scores[0] <= 100
+        assert 0 <= scores[1] <= 70
+
+    def test_batch_matches_single_frame(self, poses):
+        detector = PoseDetector(load_model=False)
+
+        class Landmark:
+            def __init__(self, x, y, z):
+                self.x, self.y, self.z = x, y, z
+
+        class Landmarks:
+            def __init__(self, pose):
+                self.landmark = [Landmark(*point[:3]) for point in pose]
+
+        scores, _ = score_poses(poses)
+        for pose, score in zip(poses, scores):
+            single = detector._calculate_posture_score(Landmarks(pose))
+            assert single == pytest.approx(score, abs=1e-4)
+
+    def test_accepts_xyz_only(self, poses):
+        with_visibility, _ = score_poses(poses)
+        xyz_only, _ = score_poses(poses[..., :3])
+        assert np.allclose(with_visibility, xyz_only)
+
+    def test_degenerate_vectors_have_zero_angle(self):
+        vectors = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        angles = angles_between(vectors, np.array([0, -1, 0]))
+        assert angles[0] == 0.0
+        assert angles[1] == pytest.approx(90.0)
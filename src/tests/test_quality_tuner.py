@@ -0,0 +1,130 @@
+import pytest
+
+from ..quality_tuner import QualityTuner
+
+LADDER = [(0, 640, 360), (1, 960, 540), (2, 1280, 720)]
+
+
+class FakeDetector:
+    def __init__(self, quality=(1, 960, 540)):
+        self.model_complexity, self.inference_width, self.inference_height = quality
+        self.changes = []
+
+    def set_quality(self, model_complexity, width, height):
+        self.model_complexity = model_complexity
+        self.inference_width, self.inference_height = width, height
+        self.changes.append((model_complexity, width, height))
+
+
+@pytest.fixture
+def cpu():
+    return {"percent": 20.0}
+
+
+@pytest.fixture
+def detector():
+    return FakeDetector()
+
+
+@pytest.fixture
+def tuner(detector, cpu):
+    return QualityTuner(
+        detector,
+        ladder=LADDER,
+        latency_budget=0.1,
+        cpu_budget=80.0,
+        window=10,
+        down_cooldown=5.0,
+        up_cooldown=30.0,
+        retry_after=120.0,
+        cpu_sampler=lambda: cpu["percent"],
+    )
+
+
+def feed(tuner, latency, start, frames=10, fps=10.0):
+    for i in range(frames):
+        tuner.observe(latency, now=start + i / fps)
+
+
+class TestQualityTuner:
+    def test_starts_at_detector_quality(self, tuner, detector):
+        assert tuner.quality == (1, 960, 540)
+        assert detector.changes == []
+
+    def test_slow_frames_step_down(self, tuner, detector):
+        feed(tuner, 0.2, start=0.0)
+        assert tuner.quality == (0, 640, 360)
+        assert detector.changes == [(0, 640, 360)]
+
+    def test_high_cpu_steps_down(self, tuner, cpu):
+        cpu["percent"] = 95.0
+        feed(tuner, 0.02, start=0.0)
+        assert tuner.level == 0
+
+    def test_fast_frames_step_up_after_cooldown(self, tuner):
+        feed(tuner, 0.01, start=0.0)
+        assert tuner.quality == (2, 1280, 720)
+        # Just changed, so the next step waits for up_cooldown
+        feed(tuner, 0.01, start=1.0)
+        assert tuner.level == 2
+
+    def test_in_between_holds_level(self, tuner):
+        feed(tuner, 0.08, start=0.0)  # under budget but above headroom
+        assert tuner.level == 1
+
+    def test_failed_level_not_retried_right_away(self, tuner):
+        feed(tuner, 0.2, start=0.0)  # level 1 fails, drop to 0
+        assert tuner.level == 0
+        feed(tuner, 0.01, start=40.0)  # up_cooldown passed, retry_after not
+        assert tuner.level == 0
+        feed(tuner, 0.01, start=130.0)
+        assert tuner.level == 1
+
+    def test_partial_window_does_nothing(self, tuner, detector):
+        feed(tuner, 1.0, start=0.0, frames=5)
+        assert detector.changes == []
+
+    def test_explicit_start_level_is_applied(self, detector, cpu):
+        tuner = QualityTuner(
+            detector, ladder=LADDER, level=0, cpu_sampler=lambda: cpu["percent"]
+        )
+        assert tuner.quality == (0, 640, 360)
+        assert detector.changes == [(0, 640, 360)]
+
+    def test_unavailable_model_removed_from_ladder(self, tuner, detector):
+        def fail_lite(model_complexity, width, height):
+            if model_complexity == 0:
+                raise RuntimeError("download failed")
+            FakeDetector.set_quality(detector, model_complexity, width, height)
+
+        detector.set_quality = fail_lite
+        feed(tuner, 0.2, start=0.0)
+        assert tuner.ladder == LADDER[1:]
+        assert tuner.quality == (1, 960, 540)
+
+    def test_failed_resize_keeps_current_level(self, detector, cpu):
+        ladder = [(0, 640, 360), (0, 960, 540), (1, 960, 540)]
+        detector = FakeDetector((0, 640, 360))
+        tuner = QualityTuner(
+            detector,
+            ladder=ladder,
+            window=10,
+            up_cooldown=30.0,
+            retry_after=120.0,
+            cpu_sampler=lambda: cpu["percent"],
+        )
+
+        def fail_resize(model_complexity, width, height):
+            raise TimeoutError("worker did not start")
+
+        detector.set_quality = fail_resize
+        feed(tuner, 0.01, start=0.0)
+        # Nothing is pruned and the tuner still matches the detector
+        assert tuner.ladder == ladder
+        assert tuner.quality == (0, 640, 360)
+        # The failed level waits out retry_after like an over-budget one
+        detector.set_quality = FakeDetector.set_quality.__get__(detector)
+        feed(tuner, 0.01, start=60.0)
+        assert tuner.quality == (0, 640, 360)
+        feed(tuner, 0.01, start=200.0)
+        assert tuner.quality == (0, 960, 540)
@@ -0,0 +1,67 @@
+import pytest
+
+from ..rate_scheduler import AdaptiveRateScheduler
+
+
+@pytest.fixture
+def scheduler():
+    return AdaptiveRateScheduler(min_fps=1, max_fps=30, half_life=1.0)
+
+
+def make_landmarks(offset):
+    class Landmark:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    class Landmarks:
+        landmark = [Landmark(0.5 + offset, 0.5) for _ in range(33)]
+
+    return Landmarks()
+
+
+class TestAdaptiveRateScheduler:
+    def test_stable_score_ramps_down_to_min(self, scheduler):
+        for second in range(20):
+            scheduler.observe_score_variance(1.0, now=float(second))
+        assert scheduler.fps == 1
+        assert scheduler.interval == 1.0
+
+    def test_half_life_decay(self, scheduler):
+        scheduler.observe_score_variance(0.0, now=0.0)
+        scheduler.observe_score_variance(0.0, now=1.0)
+        assert scheduler.fps == pytest.approx(15)
+
+    def test_variance_ramps_back_up(self, scheduler):
+        for second in range(20):
+            scheduler.observe_score_variance(0.0, now=float(second))
+        scheduler.observe_score_variance(100.0, now=20.0)
+        assert scheduler.fps == 30
+
+    def test_landmark_velocity_ramps_back_up(self, scheduler):
+        for second in range(20):
+            scheduler.observe_landmarks(make_landmarks(0.0), now=float(second))
+        assert scheduler.fps == 1
+
+        scheduler.observe_landmarks(make_landmarks(0.2), now=20.5)
+        assert scheduler.fps == 30
+
+    def test_missing_landmarks_keep_rate(self, scheduler):
+        scheduler.observe_score_variance(0.0, now=0.0)
+        scheduler.observe_score_variance(0.0, now=2.0)
+        scheduler.observe_landmarks(None, now=2.5)
+        assert scheduler.fps == pytest.approx(7.5)
+
+    def test_reset(self, scheduler):
+        for second in range(20):
+            scheduler.observe_score_variance(0.0, now=float(second))
+        scheduler.reset()
+        assert scheduler.fps == 30
+
+    def test_out_of_order_observations_do_not_rewind(self, scheduler):
+        # The UI and inference threads stamp their own times
+        scheduler.observe_score_variance(0.0, now=0.0)
+        scheduler.observe_score_variance(0.0, now=2.0)
+        scheduler.observe_landmarks(make_landmarks(0.0), now=1.0)
+        assert scheduler.fps == pytest.approx(7.5)
+        scheduler.observe_score_variance(0.0, now=3.0)
+        assert scheduler.fps == pytest.approx(3.75)
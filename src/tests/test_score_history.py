@@ -30,12 +30,15 @@ class TestScoreHistory:
         sleep(1.1)
         assert sh.get_average_score() == 0
 
+    def test_window_size_collision_rejected(self, sh):
+        with pytest.raises(ValueError):
+            sh.WINDOW_SIZE = 60
+        assert sh.WINDOW_SIZE == 5
+        assert set(sh.windows) == {5, 60, 900}
+
     def test_partial_window(self, sh):
-        sh.timestamps[0] = time() - 3
-        sh.timestamps[1] = time() - 6
-        sh.scores[0] = 100
-        sh.scores[1] = 50
-        sh.current_index = 2
+        sh.add_score(50, timestamp=time() - 6)
+        sh.add_score(100, timestamp=time() - 3)
         assert sh.get_average_score() == 100
 
     @pytest.mark.parametrize(
@@ -51,12 +54,46 @@ class TestScoreHistory:
 
         assert isinstance(sh.get_average_score(), float)
         assert sh.get_average_score() >= 0
-
-        if num_scores >= sh.buffer_size:
-            assert sh.is_buffer_full
-            assert sh.current_index == num_scores % sh.buffer_size
+        assert sh.get_sample_count(window=900) == num_scores
 
     @pytest.mark.parametrize("score", [-1000, 1000])
     def test_boundary_scores(self, sh, score):
         sh.add_score(score)
         assert isinstance(sh.get_average_score(), float)
+
+    def test_score_variance(self, sh):
+        assert sh.get_score_variance() == 0.0
+        for score in [70, 80, 90]:
+            sh.add_score(score)
+        assert abs(sh.get_score_variance() - 200 / 3) < 0.01
+
+    def test_concurrent_windows(self, sh):
+        now = time()
+        sh.add_score(20, timestamp=now - 600)
+        sh.add_score(40, timestamp=now - 30)
+        sh.add_score(90, timestamp=now - 1)
+        assert sh.get_average_score() == 90
+        assert sh.get_average_score(window=60) == 65
+        assert sh.get_average_score(window=900) == 50
+        assert sh.get_sample_count(window=900) == 3
+        assert abs(sh.get_score_variance(window=60) - 625) < 0.01
+
+    def test_expired_samples_evicted(self, sh):
+        now = time()
+        for i in range(100):
+            sh.add_score(i, timestamp=now - 100 + i)
+        # Only the last ~5 s survive in the default window
+        assert sh.windows[5].count <= 6
+        assert sh.windows[900].count == 100
+
+    def test_ewma_respects_irregular_spacing(self):
+        sh = ScoreHistory(ewma_time_constant=5.0)
+        sh.add_score(0, timestamp=0.0)
+        sh.add_score(100, timestamp=0.1)
+        quick = sh.get_ewma()
+        sh = ScoreHistory(ewma_time_constant=5.0)
+        sh.add_score(0, timestamp=0.0)
+        sh.add_score(100, timestamp=50.0)
+        assert quick < 5
+        assert sh.get_ewma() > 99
+        assert sh.ewm_variance > 0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from ..score_history import RollupRing, ScoreTimeline
+
+
+class TestRollupRing:
+    def test_aggregates_within_bucket(self):
+        ring = RollupRing(resolution=60, capacity=10)
+        assert ring.add(0, 1, 50.0, 50.0, 50.0) is None
+        assert ring.add(30, 1, 70.0, 70.0, 70.0) is None
+        trend = ring.query()
+        assert trend["count"].tolist() == [2]
+        assert trend["mean"].tolist() == [60.0]
+        assert (trend["min"][0], trend["max"][0]) == (50.0, 70.0)
+
+    def test_closing_bucket_is_returned(self):
+        ring = RollupRing(resolution=60, capacity=10)
+        ring.add(0, 1, 50.0, 50.0, 50.0)
+        closed = ring.add(61, 1, 70.0, 70.0, 70.0)
+        assert closed == (0, 1, 50.0, 50.0, 50.0)
+
+    def test_memory_is_bounded(self):
+        ring = RollupRing(resolution=1, capacity=5)
+        for t in range(20):
+            ring.add(t, 1, float(t), float(t), float(t))
+        trend = ring.query()
+        assert trend["bucket"].tolist() == [15, 16, 17, 18, 19]
+        assert ring.query(since=18)["bucket"].tolist() == [18, 19]
+
+
+class TestScoreTimeline:
+    def test_cascades_to_coarser_levels(self):
+        timeline = ScoreTimeline()
+        # Two hours of one sample per second, alternating 60 and 80
+        for t in range(7200):
+            timeline.add(float(t), 60.0 if t % 2 else 80.0)
+        # Push the last second, minute and hour through the cascade
+        timeline.add(3 * 3600.0, 70.0)
+
+        minutes = timeline.query("minute")
+        assert len(minutes) == 121
+        assert minutes["count"][0] == 60
+        assert minutes["mean"][0] == pytest.approx(70.0)
+
+        hours = timeline.query("hour")
+        assert hours["count"].tolist() == [3600, 3600, 1]
+        assert np.allclose(hours["mean"], 70.0)
+        assert hours["min"][0] == 60.0 and hours["max"][0] == 80.0
+
+        # The seconds ring only holds its fixed capacity
+        assert len(timeline.query("second")) == 3600
@@ -0,0 +1,111 @@
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from ..frame_sources import SyntheticSource
+from ..webcam import Webcam
+
+
+class FakeCapture:
+    def __init__(self, *args):
+        self.frame_id = 0
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def get(self, prop):
+        return 0
+
+    def read(self):
+        self.frame_id += 1
+        return True, np.full((4, 4, 3), self.frame_id % 256, dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def webcam():
+    with patch("cv2.VideoCapture", FakeCapture):
+        cam = Webcam(fps=200)
+        yield cam
+        cam.stop()
+
+
+def test_slow_inference_drops_oldest_frames(webcam):
+    seen = []
+
+    def slow_callback(frame, timestamp):
+        seen.append(int(frame[0, 0, 0]))
+        time.sleep(0.05)
+        return frame, 50.0, None
+
+    assert webcam.start(callback=slow_callback)
+    time.sleep(0.3)
+    webcam.stop()
+
+    stats = webcam.get_stats()
+    assert stats["dropped"] > 0
+    assert stats["processed"] == len(seen)
+    # Every captured frame is processed, dropped, or still waiting in the slot
+    assert stats["captured"] - stats["processed"] - stats["dropped"] in (0, 1)
+    # Inference only ever moves forward to newer frames
+    assert seen == sorted(seen)
+    assert webcam.get_latest_frame()[1] == 50.0
+
+
+def test_stop_without_frames(webcam):
+    assert webcam.start()
+    webcam.stop()
+    assert not webcam.is_running.is_set()
+    assert webcam.thread is None and webcam.inference_thread is None
+
+
+def test_result_callback_once_per_analyzed_frame(webcam):
+    delivered = []
+    webcam.result_callback = lambda *result: delivered.append(result)
+
+    assert webcam.start(callback=lambda frame, timestamp: (frame, 75.0, None))
+    time.sleep(0.2)
+    webcam.stop()
+
+    assert len(delivered) == webcam.get_stats()["processed"]
+    frame, score, results, timestamp = delivered[-1]
+    assert score == 75.0 and results is None
+    assert timestamp <= time.time()
+    # Capture timestamps only move forward
+    timestamps = [result[3] for result in delivered]
+    assert timestamps == sorted(timestamps)
+
+
+def test_callback_errors_are_logged(webcam, caplog):
+    def failing_callback(frame, timestamp):
+        raise RuntimeError("detector gone")
+
+    with caplog.at_level("ERROR", logger="posture_tracker"):
+        assert webcam.start(callback=failing_callback)
+        time.sleep(0.1)
+        webcam.stop()
+
+    record = caplog.records[0]
+    assert record.getMessage() == "frame_callback_error"
+    assert record.fields == {"error": "detector gone"}
+
+
+def test_custom_frame_source():
+    cam = Webcam(fps=200, source=SyntheticSource(width=8, height=4, pool_size=2))
+    shapes = []
+
+    def callback(frame, timestamp):
+        shapes.append(frame.shape)
+        return frame, 60.0, None
+
+    assert cam.start(callback=callback)
+    time.sleep(0.1)
+    cam.stop()
+    assert shapes and set(shapes) == {(4, 8, 3)}
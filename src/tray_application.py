@@ -1,20 +1,63 @@
+import time
 from datetime import datetime, timedelta
+from threading import Thread
 
 import cv2
 import numpy as np
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QActionGroup, QIcon, QImage, QPixmap
-from PyQt6.QtWidgets import QApplication, QMenu, QSystemTrayIcon
+from PyQt6.QtWidgets import QApplication, QMenu, QMessageBox, QSystemTrayIcon
 
 from db_manager import DBManager
+from instrumentation import metrics, release_memory, rss_bytes
+from landmark_filter import OneEuroFilter
+from motion_gate import MotionGate
 from notifications import NotificationManager
 from pose_detector import PoseDetector
+from pose_worker import ProcessPoseDetector
+from quality_tuner import QualityTuner
+from rate_scheduler import AdaptiveRateScheduler
 from score_history import ScoreHistory
+from video_window import VideoPreview
 from webcam import Webcam
 
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# The preview is drawn at this size while analysis keeps full resolution
+PREVIEW_WIDTH, PREVIEW_HEIGHT = 640, 360
+
+# Idle time after the icon appears before the pose model loads in the
+# background; starting tracking sooner just waits for it
+MODEL_WARMUP_DELAY_MS = 1000
+
+
+def sparkline(values, width=24):
+    """Render 0-100 scores as a row of block characters"""
+    if len(values) == 0:
+        return ""
+    if len(values) > width:
+        values = [chunk.mean() for chunk in np.array_split(values, width)]
+    levels = np.clip(
+        np.asarray(values) / 100 * len(SPARK_CHARS), 0, len(SPARK_CHARS) - 1
+    )
+    return "".join(SPARK_CHARS[int(level)] for level in levels)
+
+
+class ResultBridge(QObject):
+    """Carries analysis results from the inference thread to the Qt thread"""
+
+    # frame, score, pose results, capture timestamp
+    result_ready = pyqtSignal(object, float, object, float)
+
 
 class PostureTrackerTray(QSystemTrayIcon):
-    def __init__(self):
+    # Emitted from the thread that opens the database
+    database_opened = pyqtSignal(object)
+    database_failed = pyqtSignal(str)
+
+    def __init__(
+        self, out_of_process=False, source=None, auto_quality=True, roi_tracking=False
+    ):
         super().__init__()
 
         # Add signal handler for clean shutdown
@@ -22,32 +65,86 @@ class PostureTrackerTray(QSystemTrayIcon):
 
         signal.signal(signal.SIGINT, self.signal_handler)
 
-        self.frame_reader = Webcam()
-        self.detector = PoseDetector()
+        self.rate_scheduler = AdaptiveRateScheduler(min_fps=1, max_fps=30)
+        # Results are pushed from the inference thread through a queued
+        # signal, so the UI only wakes up when there is something new
+        self.result_bridge = ResultBridge()
+        self.result_bridge.result_ready.connect(
+            self.on_analysis_result, Qt.ConnectionType.QueuedConnection
+        )
+        motion_gate = MotionGate()
+        self.frame_reader = Webcam(
+            rate_scheduler=self.rate_scheduler,
+            motion_gate=motion_gate,
+            result_callback=self.result_bridge.result_ready.emit,
+            source=source,
+        )
+        # Out of process, MediaPipe no longer competes with the tray for the GIL
+        detector_kwargs = {
+            "frame_width": PREVIEW_WIDTH,
+            "frame_height": PREVIEW_HEIGHT,
+            "inference_width": 1280,
+            "inference_height": 720,
+            # Smoothed landmarks keep scores steady at low inference rates.
+            # A still scene is analyzed at min_fps and may be skipped up to
+            # max_skipped times in a row; the pose has not changed over such
+            # a gap, so the filter should carry on rather than restart.
+            "landmark_filter": OneEuroFilter(
+                max_gap=(motion_gate.max_skipped + 1) / self.rate_scheduler.min_fps
+                + 1.0
+            ),
+            "roi_tracking": roi_tracking,
+        }
+        self.detector = (
+            ProcessPoseDetector(**detector_kwargs)
+            if out_of_process
+            else PoseDetector(load_model=False, **detector_kwargs)
+        )
+        # Only draw the overlay while the video window is open
+        self.detector.render_overlay = False
+        # Steps model complexity and inference size to fit this machine
+        self.quality_tuner = QualityTuner(self.detector) if auto_quality else None
+        self.frame_reader.quality_tuner = self.quality_tuner
         self.scores = ScoreHistory()
         self.notifier = NotificationManager()
 
         self.tracking_enabled = False
         self.video_window = None
+        self.last_tooltip_update = 0
+
+        # Rendered icons keyed by (integer score, theme); there are only 101
+        # scores, so each icon is drawn once and setIcon only runs on change
+        self.icon_theme = "default"
+        self._icon_cache = {}
+        self._displayed_icon = None
         self.current_score = 0
         self.tracking_interval = 0  # 0 means continuous tracking
         self.last_tracking_time = None
+        # Between interval windows the model, camera and frame buffers are
+        # released, and brought back this many seconds before the next window
+        self.suspended = False
+        self.prewarm_seconds = 30
         self.interval_timer = QTimer()
         self.interval_timer.timeout.connect(self.check_interval)
         self.interval_timer.start(1000)  # Check every second
 
-        self.db = DBManager("posture_data.db")
+        # Opened on a background thread the first time database logging is
+        # enabled; a schema migration or rollup rebuild can take a while
+        self.db = None
+        self._db_opener = None
+        self.database_opened.connect(self._on_database_opened)
+        self.database_failed.connect(self._on_database_failed)
         self.last_db_save = None
         self.db_enabled = False
+        # Writes go through DBManager's background writer, so this can be
+        # much shorter than the commit cost would otherwise allow
+        self.db_save_interval = 60  # seconds between continuous-mode saves
 
         self.setup_tray()
-
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_tracking)
-        self.timer.start(100)  # Update every 100ms
+        QTimer.singleShot(MODEL_WARMUP_DELAY_MS, self.detector.load_model_async)
 
     def setup_tray(self):
-        self.setIcon(self.create_score_icon(0))
+        self.set_score_icon(0)
 
         menu = QMenu()
 
@@ -89,6 +186,9 @@ class PostureTrackerTray(QSystemTrayIcon):
         self.toggle_db_action.triggered.connect(self.toggle_database)
 
         menu.addAction(self.toggle_db_action)
+        menu.addAction(
+            QAction("Performance stats", menu, triggered=self.show_performance_stats)
+        )
         menu.addSeparator()
         menu.addAction(
             QAction("Quit Application", menu, triggered=self.quit_application)
@@ -97,7 +197,22 @@ class PostureTrackerTray(QSystemTrayIcon):
         self.setContextMenu(menu)
         self.setVisible(True)
 
+    def set_score_icon(self, score):
+        """Show the score in the tray, skipping setIcon if it is unchanged"""
+        key = (min(max(int(score), 0), 100), self.icon_theme)
+        if key == self._displayed_icon:
+            return
+        self.setIcon(self.create_score_icon(key[0]))
+        self._displayed_icon = key
+
     def create_score_icon(self, score):
+        key = (min(max(int(score), 0), 100), self.icon_theme)
+        icon = self._icon_cache.get(key)
+        if icon is None:
+            icon = self._icon_cache[key] = self._render_score_icon(key[0])
+        return icon
+
+    def _render_score_icon(self, score):
         img = np.zeros((64, 64, 4), dtype=np.uint8)
         img[:, :, 3] = 0
 
@@ -125,6 +240,8 @@ class PostureTrackerTray(QSystemTrayIcon):
 
     def toggle_tracking(self):
         if not self.tracking_enabled:
+            self.resume_detector()
+            self.rate_scheduler.reset()
             self.frame_reader.start(callback=self.detector.process_frame)
             self.tracking_enabled = True
             self.toggle_tracking_action.setText("Stop Tracking")
@@ -143,29 +260,40 @@ class PostureTrackerTray(QSystemTrayIcon):
             self.toggle_video_action.setEnabled(False)
             self.toggle_video_action.setText("Show Video")
             if self.video_window:
-                cv2.destroyWindow("Posture Detection")
-                self.video_window = None
-            self.setIcon(self.create_score_icon(0))
+                self.video_window.close()
+            self.set_score_icon(0)
 
     def toggle_video(self):
         if self.video_window:
-            cv2.destroyWindow("Posture Detection")
-            self.video_window = None
-            self.toggle_video_action.setText("Show Video")
+            self.video_window.close()
         else:
-            self.video_window = True
+            self.video_window = VideoPreview(width=PREVIEW_WIDTH, height=PREVIEW_HEIGHT)
+            self.video_window.closed.connect(self._on_video_closed)
+            self.video_window.show()
             self.toggle_video_action.setText("Hide Video")
+            self.detector.render_overlay = True
+
+    def _on_video_closed(self):
+        """Runs however the preview was closed, menu or window button"""
+        self.video_window = None
+        self.toggle_video_action.setText("Show Video")
+        self.detector.render_overlay = False
 
-    def update_tracking(self):
+    def on_analysis_result(self, frame, score, results, timestamp):
+        # Results queued before tracking stopped can still arrive
         if self.tracking_enabled:
-            frame, score = self.frame_reader.get_latest_frame()
             if frame is not None:
-                self.scores.add_score(score)
+                self.scores.add_score(score, timestamp)
                 average_score = self.scores.get_average_score()
+                self.rate_scheduler.observe_score_variance(
+                    self.scores.get_score_variance()
+                )
 
-                self.setIcon(self.create_score_icon(average_score))
+                self.set_score_icon(average_score)
+                if time.time() - self.last_tooltip_update >= 10:
+                    self._update_tooltip(average_score)
 
-                if self.db_enabled:
+                if self.db_enabled and self.db:
                     current_time = datetime.now()
 
                     if (
@@ -175,26 +303,65 @@ class PostureTrackerTray(QSystemTrayIcon):
                         and (current_time - self.last_tracking_time).total_seconds()
                         <= 60
                     ):
-                        self._save_to_db(average_score)
+                        self._save_to_db(results, average_score)
 
                     elif self.tracking_interval == 0 and (
                         self.last_db_save is None
-                        or (current_time - self.last_db_save).total_seconds() >= 60
+                        or (current_time - self.last_db_save).total_seconds()
+                        >= self.db_save_interval
                     ):
-                        self._save_to_db(average_score)
+                        self._save_to_db(results, average_score)
 
                 self.notifier.check_and_notify(average_score)
                 if self.video_window:
-                    cv2.imshow("Posture Detection", frame)
-                    cv2.waitKey(1)
-
-    def _save_to_db(self, average_score):
+                    self.video_window.set_frame(frame)
+
+    def _update_tooltip(self, average_score):
+        """Summarize the in-memory timeline; never touches the database"""
+        now = time.time()
+        self.last_tooltip_update = now
+        last_hour = self.scores.get_trend("minute", since=now - 3600)
+        today = self.scores.get_trend(
+            "hour",
+            since=datetime.now()
+            .replace(hour=0, minute=0, second=0, microsecond=0)
+            .timestamp(),
+        )
+        lines = [f"Posture score: {average_score:.0f}"]
+        if len(last_hour):
+            lines.append(f"Last hour: {sparkline(last_hour['mean'])}")
+        if len(today):
+            today_mean = today["mean"] @ today["count"] / today["count"].sum()
+            lines.append(f"Today: {sparkline(today['mean'])} avg {today_mean:.0f}")
+        self.setToolTip("\n".join(lines))
+
+    def _save_to_db(self, results, average_score):
         """Helper method to save pose data to database"""
-        results = self.frame_reader.get_latest_pose_results()
         if results and results.pose_landmarks:
             self.db.save_pose_data(results.pose_landmarks, average_score)
             self.last_db_save = datetime.now()
 
+    def show_performance_stats(self):
+        """Show the hot-path timings, turning collection on the first time"""
+        if not metrics.enabled:
+            metrics.enable()
+            text = (
+                "Performance stats collection started.\n"
+                "Open this again after a few minutes of tracking."
+            )
+        else:
+            frames = ", ".join(
+                f"{k} {v}" for k, v in self.frame_reader.get_stats().items()
+            )
+            complexity = self.detector.model_complexity
+            width = self.detector.inference_width
+            height = self.detector.inference_height
+            text = (
+                f"{metrics.format_summary()}\n\nFrames: {frames}\n"
+                f"Quality: model complexity {complexity}, {width}x{height}"
+            )
+        QMessageBox.information(None, "Performance stats", text)
+
     def quit_application(self):
         """Clean up application resources and quit"""
         try:
@@ -202,14 +369,20 @@ class PostureTrackerTray(QSystemTrayIcon):
                 self.toggle_tracking()
 
             if self.video_window:
-                cv2.destroyAllWindows()
-                self.video_window = None
+                self.video_window.close()
 
-            if hasattr(self, "db"):
+            if self._db_opener is not None:
+                # Let an open in progress finish, and deliver the result so
+                # the database is closed below
+                self._db_opener.join()
+                QApplication.processEvents()
+
+            if self.db:
                 self.db.close()
 
-            if hasattr(self, "timer"):
-                self.timer.stop()
+            if hasattr(self, "detector"):
+                self.detector.close()
+
             if hasattr(self, "interval_timer"):
                 self.interval_timer.stop()
 
@@ -232,6 +405,27 @@ class PostureTrackerTray(QSystemTrayIcon):
             if self.tracking_enabled:
                 self.toggle_tracking()
 
+    def suspend_detector(self):
+        """Release the model and buffers while waiting for the next window"""
+        if self.suspended or self.tracking_enabled:
+            return
+        before = rss_bytes()
+        self.detector.suspend()
+        release_memory()
+        self.suspended = True
+        print(
+            f"Suspended until the next check: RSS {before / 2**20:.0f} MB -> "
+            f"{rss_bytes() / 2**20:.0f} MB"
+        )
+
+    def resume_detector(self):
+        """Start reloading the model; a no-op unless suspended"""
+        if not self.suspended:
+            return
+        self.suspended = False
+        self.detector.resume()
+        print(f"Resuming tracking: RSS {rss_bytes() / 2**20:.0f} MB")
+
     def check_interval(self):
         if self.tracking_interval <= 0:
             return
@@ -243,10 +437,16 @@ class PostureTrackerTray(QSystemTrayIcon):
             self.start_interval_tracking()
             return
 
-        if current_time - self.last_tracking_time >= timedelta(
-            minutes=self.tracking_interval
-        ):
+        until_next = (
+            self.last_tracking_time
+            + timedelta(minutes=self.tracking_interval)
+            - current_time
+        )
+        if until_next <= timedelta(0):
             self.start_interval_tracking()
+        elif until_next <= timedelta(seconds=self.prewarm_seconds):
+            # Load the model ahead of time so the window starts at full speed
+            self.resume_detector()
 
     def start_interval_tracking(self):
         """Start tracking posture for a fixed interval"""
@@ -266,6 +466,7 @@ class PostureTrackerTray(QSystemTrayIcon):
         try:
             if self.tracking_enabled and self.tracking_interval > 0:
                 self.toggle_tracking()
+                self.suspend_detector()
         except Exception as e:
             print(f"Error stopping interval tracking: {e}")
 
@@ -273,8 +474,30 @@ class PostureTrackerTray(QSystemTrayIcon):
         """Toggle database logging on/off"""
         self.db_enabled = checked
         if checked:
+            if self.db is None and self._db_opener is None:
+                self._db_opener = Thread(target=self._open_database, daemon=True)
+                self._db_opener.start()
             self.last_db_save = None
 
+    def _open_database(self):
+        """Runs on the opener thread, so the menu stays responsive"""
+        try:
+            db = DBManager("posture_data.db")
+        except Exception as e:
+            self.database_failed.emit(str(e))
+        else:
+            self.database_opened.emit(db)
+
+    def _on_database_opened(self, db):
+        self._db_opener = None
+        self.db = db
+
+    def _on_database_failed(self, message):
+        self._db_opener = None
+        print(f"Error opening database: {message}")
+        self.db_enabled = False
+        self.toggle_db_action.setChecked(False)
+
     def signal_handler(self, signum, frame):
         """Handle interrupt signals gracefully"""
         print("\nReceived interrupt signal. Cleaning up...")
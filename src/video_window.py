@@ -0,0 +1,85 @@
+import numpy as np
+from PyQt6.QtCore import QRectF, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter
+from PyQt6.QtWidgets import QWidget
+
+
+class VideoPreview(QWidget):
+    """Qt window showing the latest annotated frame.
+
+    set_frame only stores a reference; a timer repaints at most
+    ``preview_fps`` times per second, independent of the inference rate. The
+    BGR frame buffer is wrapped in a QImage without copying and scaled to the
+    window by QPainter.
+    """
+
+    closed = pyqtSignal()
+
+    def __init__(self, preview_fps=15, width=640, height=360):
+        super().__init__()
+        self.setWindowTitle("Posture Detection")
+        self.resize(width, height)
+        self._frame = None
+        self._dirty = False
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._repaint_if_dirty)
+        self.set_preview_fps(preview_fps)
+
+    def set_preview_fps(self, preview_fps):
+        self.preview_fps = preview_fps
+        self._timer.setInterval(int(1000 / preview_fps))
+
+    def set_frame(self, frame: np.ndarray):
+        # Frames are never written to after they are handed over, so holding
+        # a reference is enough
+        self._frame = frame
+        self._dirty = True
+
+    def showEvent(self, event):
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        self._frame = None
+        self.closed.emit()
+        super().closeEvent(event)
+
+    def _repaint_if_dirty(self):
+        if self._dirty:
+            self._dirty = False
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0))
+        frame = self._frame
+        if frame is not None:
+            if not frame.flags.c_contiguous:
+                frame = np.ascontiguousarray(frame)
+            height, width = frame.shape[:2]
+            # Wraps the NumPy buffer; frame stays referenced until painted
+            image = QImage(
+                frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888
+            )
+            scale = min(self.width() / width, self.height() / height)
+            target = QRectF(
+                (self.width() - width * scale) / 2,
+                (self.height() - height * scale) / 2,
+                width * scale,
+                height * scale,
+            )
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawImage(target, image)
+        painter.end()
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key.Key_Escape, Qt.Key.Key_Q):
+            self.close()
+        else:
+            super().keyPressEvent(event)
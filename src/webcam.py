@@ -1,79 +1,225 @@
+import logging
 import time
-from threading import Event, Thread
+from threading import Condition, Event, Thread, current_thread
 
-import cv2
+from frame_sources import CameraSource
+from instrumentation import metrics
+
+logger = logging.getLogger("posture_tracker")
 
 
 class Webcam:
-    def __init__(self, camera_id=0, fps=30):
+    def __init__(
+        self,
+        camera_id=0,
+        fps=30,
+        rate_scheduler=None,
+        motion_gate=None,
+        result_callback=None,
+        source=None,
+        quality_tuner=None,
+    ):
         self.camera_id = camera_id
-        self.cap = None
+        # Any FrameSource; by default the camera at the detector's 1280x720
+        self.source = source or CameraSource(camera_id, fps=fps)
         self.is_running = Event()
+        self._stop_event = Event()
         self.thread = None
+        self.inference_thread = None
         self.fps = fps
         self.frame_time = 1 / fps
         self._latest_frame = None
         self._latest_score = 0
         self._callback = None
         self._latest_pose_results = None
+        # Optional AdaptiveRateScheduler pacing the inference thread; capture
+        # keeps running at fps so the newest frame is always at hand
+        self.rate_scheduler = rate_scheduler
+        # Optional MotionGate; frames it rejects keep the previous result
+        self.motion_gate = motion_gate
+        # Called from the inference thread as (frame, score, results,
+        # timestamp) once per analyzed frame, including frames the motion
+        # gate judged unchanged, which repeat the previous result. The
+        # timestamp is when the frame was captured.
+        self.result_callback = result_callback
+        # Optional QualityTuner fed the callback's processing time
+        self.quality_tuner = quality_tuner
+
+        # Single-slot handoff between the capture and inference threads. A new
+        # frame replaces an unconsumed one, so inference always sees the
+        # newest frame and capture never waits on inference.
+        self._slot_condition = Condition()
+        self._pending_frame = None
+        self._pending_timestamp = None
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
 
     def start(self, callback=None):
-        """Start the camera capture with optional callback for frame processing"""
+        """Start the camera capture with optional callback for frame processing.
+
+        The callback is called as ``callback(frame, timestamp)`` with the
+        frame's capture time and returns ``(frame, score, results)``.
+        """
         if self.is_running.is_set():
             return False
 
-        self.cap = cv2.VideoCapture(self.camera_id)
-        if not self.cap.isOpened():
+        if not self.source.open():
             return False
 
         self._callback = callback
+        self._pending_frame = None
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self._stop_event.clear()
+        if self.motion_gate:
+            self.motion_gate.reset()
         self.is_running.set()
         self.thread = Thread(target=self._capture_loop)
         self.thread.daemon = True
         self.thread.start()
+        self.inference_thread = Thread(target=self._inference_loop)
+        self.inference_thread.daemon = True
+        self.inference_thread.start()
         return True
 
     def stop(self):
         """Stop the camera capture"""
-        self.is_running.clear()
-        if self.thread:
-            self.thread.join()  # Wait for thread to finish
-        if self.cap:
-            self.cap.release()
-        self.cap = None
+        self._shutdown()
+        for thread in (self.thread, self.inference_thread):
+            # The loops call _shutdown themselves on errors, never stop()
+            if thread and thread is not current_thread():
+                thread.join()  # Wait for thread to finish
+        self.source.release()
         self.thread = None
+        self.inference_thread = None
+        # Don't keep full-size frames alive while stopped; the last score and
+        # results stay available
+        self._latest_frame = None
+        self._pending_frame = None
+
+    def _shutdown(self):
+        """Signal both loops to exit and wake the inference thread"""
+        self.is_running.clear()
+        self._stop_event.set()
+        with self._slot_condition:
+            self._slot_condition.notify_all()
 
     def _capture_loop(self):
-        """Main capture loop running in separate thread"""
+        """Capture loop: keeps only the newest frame for the inference thread"""
         while self.is_running.is_set():
             start_time = time.time()
+            read_start = time.perf_counter_ns() if metrics.enabled else 0
 
             try:
-                ret, frame = self.cap.read()
+                ret, frame = self.source.read()
+                if read_start:
+                    metrics.observe(
+                        "webcam.capture_read", time.perf_counter_ns() - read_start
+                    )
                 if not ret:
-                    print("Failed to read frame from camera")
-                    self.stop()
+                    logger.warning("frame_read_failed")
+                    self._shutdown()
                     break
 
-                if self._callback:
-                    try:
-                        frame, score, results = self._callback(frame)
-                        self._latest_score = score
-                        self._latest_pose_results = results
-                    except Exception as e:
-                        print(f"Error in frame callback: {e}")
-
-                self._latest_frame = frame
+                with self._slot_condition:
+                    if self._pending_frame is not None:
+                        self.frames_dropped += 1
+                        if metrics.enabled:
+                            metrics.increment("webcam.frames_dropped")
+                    self._pending_frame = frame
+                    self._pending_timestamp = start_time
+                    self.frames_captured += 1
+                    self._slot_condition.notify()
 
             except Exception as e:
-                print(f"Error capturing frame: {e}")
-                self.stop()
+                logger.error("capture_error", extra={"fields": {"error": str(e)}})
+                self._shutdown()
                 break
 
             processing_time = time.time() - start_time
             if processing_time < self.frame_time:
                 time.sleep(self.frame_time - processing_time)
 
+    def _inference_loop(self):
+        """Inference loop: runs the callback on the newest captured frame"""
+        while True:
+            start_time = time.time()
+            with self._slot_condition:
+                while self._pending_frame is None and self.is_running.is_set():
+                    self._slot_condition.wait()
+                if not self.is_running.is_set():
+                    break
+                frame = self._pending_frame
+                timestamp = self._pending_timestamp
+                self._pending_frame = None
+
+            if self.motion_gate and not self.motion_gate.should_process(frame):
+                # Scene unchanged: keep the last frame, score and landmarks
+                if metrics.enabled:
+                    metrics.increment("webcam.frames_motion_skipped")
+                self._deliver(timestamp)
+                self._pace(start_time)
+                continue
+
+            if self._callback:
+                callback_start = time.perf_counter_ns()
+                try:
+                    frame, score, results = self._callback(frame, timestamp)
+                    callback_time = time.perf_counter_ns() - callback_start
+                    if metrics.enabled:
+                        metrics.observe("webcam.frame_callback", callback_time)
+                    if self.quality_tuner:
+                        self.quality_tuner.observe(callback_time / 1e9)
+                    self._latest_score = score
+                    self._latest_pose_results = results
+                    if self.rate_scheduler:
+                        self.rate_scheduler.observe_landmarks(
+                            results.pose_landmarks if results else None
+                        )
+                except Exception as e:
+                    logger.error(
+                        "frame_callback_error", extra={"fields": {"error": str(e)}}
+                    )
+
+            self._latest_frame = frame
+            self.frames_processed += 1
+            self._deliver(timestamp)
+            self._pace(start_time)
+
+    def _deliver(self, timestamp):
+        if self.result_callback:
+            try:
+                self.result_callback(
+                    self._latest_frame,
+                    self._latest_score,
+                    self._latest_pose_results,
+                    timestamp,
+                )
+            except Exception as e:
+                logger.error(
+                    "result_callback_error", extra={"fields": {"error": str(e)}}
+                )
+
+    def _pace(self, start_time):
+        """Hold the inference thread to the scheduler's current rate"""
+        if self.rate_scheduler:
+            delay = self.rate_scheduler.interval - (time.time() - start_time)
+            if delay > 0:
+                self._stop_event.wait(delay)
+
+    def get_stats(self):
+        """Get captured, processed, dropped and motion-skipped frame counts"""
+        stats = {
+            "captured": self.frames_captured,
+            "processed": self.frames_processed,
+            "dropped": self.frames_dropped,
+        }
+        if self.motion_gate:
+            stats.update(self.motion_gate.get_stats())
+        return stats
+
     def get_latest_frame(self):
         """Get the most recent frame and score"""
         return self._latest_frame, self._latest_score